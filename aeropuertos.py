@@ -0,0 +1,80 @@
+import pandas as pd
+
+# Columnas de aeropuertos_detalle.csv por las que se puede buscar, en orden
+# de prioridad si un mismo código aparece en más de una.
+CLAVES_AEROPUERTO = ['local', 'oaci', 'iata']
+
+
+class RegistroAeropuertos:
+    # Índice de la tabla de aeropuertos por código local, OACI e IATA. Las
+    # búsquedas son un acceso a diccionario y las de varios códigos un único
+    # join, sin recorrer la tabla. Las coordenadas se validan una sola vez.
+
+    def __init__(self, aeropuertos):
+        tabla = aeropuertos.reset_index(drop=True)
+        # En el archivo las columnas están intercambiadas: 'longitud' guarda
+        # la latitud y 'latitud' la longitud.
+        lat = pd.to_numeric(tabla['longitud'], errors='coerce')
+        lon = pd.to_numeric(tabla['latitud'], errors='coerce')
+        validas = lat.between(-90, 90) & lon.between(-180, 180)
+        self.tabla = tabla.assign(lat=lat.where(validas), lon=lon.where(validas))
+
+        self._posiciones = {}
+        for clave in reversed(CLAVES_AEROPUERTO):
+            codigos = self.tabla[clave].dropna().astype(str).str.strip()
+            codigos = codigos[codigos != '']
+            # Si un código se repite vale la primera fila, como en la tabla.
+            self._posiciones.update(zip(codigos.iloc[::-1], codigos.index[::-1]))
+
+    def __len__(self):
+        return len(self.tabla)
+
+    def __contains__(self, codigo):
+        return codigo in self._posiciones
+
+    def buscar(self, codigo):
+        posicion = self._posiciones.get(codigo)
+        return None if posicion is None else self.tabla.iloc[posicion]
+
+    def buscar_varios(self, codigos):
+        # Devuelve las filas de los códigos encontrados, en el orden pedido y
+        # con la columna 'codigo', y la lista de códigos que no existen.
+        codigos = pd.Series(list(codigos), dtype=object)
+        posiciones = codigos.map(self._posiciones)
+        encontrados = posiciones.notna()
+        filas = self.tabla.take(posiciones[encontrados].astype(int).to_numpy())
+        filas = filas.assign(codigo=codigos[encontrados].to_numpy()).reset_index(drop=True)
+        return filas, codigos[~encontrados].tolist()
+
+    def coordenadas(self, codigos):
+        # Igual que buscar_varios, pero solo los aeropuertos con coordenadas
+        # válidas; los que no las tienen se informan junto con los faltantes.
+        filas, faltantes = self.buscar_varios(codigos)
+        con_coordenadas = filas['lat'].notna()
+        faltantes += filas.loc[~con_coordenadas, 'codigo'].tolist()
+        return filas[con_coordenadas], faltantes
+
+
+def marcadores_aeropuertos(tabla):
+    # Una fila [lat, lon, popup, tooltip] por aeropuerto con coordenadas,
+    # armada columna a columna para el agrupador de marcadores del navegador.
+    tabla = tabla[tabla['lat'].notna()]
+
+    def texto(col, defecto='-'):
+        return tabla[col].fillna(defecto).astype(str)
+
+    popup = (
+        '<strong>' + texto('denominacion') + ' (' + texto('iata') + ')</strong><br>'
+        + 'OACI: ' + texto('oaci') + '<br>'
+        + 'Tipo: ' + texto('tipo') + '<br>'
+        + 'Elevación: ' + texto('elev') + ' ' + texto('uom_elev', 'Metros') + '<br>'
+        + 'Provincia: ' + texto('provincia') + '<br>'
+        + 'Uso: ' + texto('uso')
+    )
+    marcadores = pd.DataFrame({
+        'lat': tabla['lat'].round(6),
+        'lon': tabla['lon'].round(6),
+        'popup': popup,
+        'tooltip': texto('denominacion'),
+    })
+    return marcadores.to_numpy().tolist()
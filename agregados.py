@@ -0,0 +1,159 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Cubo de agregados: una fila por (mes, aeropuerto, aerolínea, tipo de
+# movimiento) con la cantidad de vuelos y pasajeros. Todos los KPIs y series
+# del dashboard se responden desde acá, así el costo depende de la cantidad
+# de grupos y no de la cantidad de vuelos.
+DIMENSIONES_CUBO = ['Mes', 'Aeropuerto', 'Aerolinea_Nombre', 'Tipo_de_Movimiento']
+
+
+def construir_cubo(vuelos):
+    mes = vuelos['Fecha_UTC'].dt.to_period('M').dt.to_timestamp().rename('Mes')
+    cubo = vuelos.groupby(
+        [mes, vuelos['Aeropuerto'], vuelos['Aerolinea_Nombre'], vuelos['Tipo_de_Movimiento']],
+        observed=True, dropna=False,
+    )['PAX'].agg(['size', 'sum', 'count'])
+    cubo.columns = ['Vuelos', 'PAX', 'Vuelos_con_PAX']
+    return cubo.reset_index()
+
+
+def combinar_cubos(cubos):
+    # Une los cubos de cada partición (informe). Un mes puede aparecer en
+    # más de una; todas las consultas suman, así que no hace falta fundirlos.
+    cubo = pd.concat(cubos, ignore_index=True)
+    for col in DIMENSIONES_CUBO[1:]:
+        cubo[col] = cubo[col].astype('category')
+    return cubo
+
+
+def filtrar_cubo(cubo, desde=None, hasta=None, aeropuertos=None, aerolineas=None, tipos=None):
+    # `desde` y `hasta` son meses inclusive; las listas vacías o None no filtran.
+    mascara = pd.Series(True, index=cubo.index)
+    if desde is not None:
+        mascara &= cubo['Mes'] >= pd.Timestamp(desde).to_period('M').to_timestamp()
+    if hasta is not None:
+        mascara &= cubo['Mes'] <= pd.Timestamp(hasta).to_period('M').to_timestamp()
+    for col, valores in (('Aeropuerto', aeropuertos), ('Aerolinea_Nombre', aerolineas),
+                         ('Tipo_de_Movimiento', tipos)):
+        if valores:
+            mascara &= cubo[col].isin(valores)
+    return cubo[mascara]
+
+
+def kpis(cubo):
+    vuelos_con_pax = cubo['Vuelos_con_PAX'].sum()
+    total_pasajeros = int(cubo['PAX'].sum())
+    return {
+        'total_vuelos': int(cubo['Vuelos'].sum()),
+        'total_pasajeros': total_pasajeros,
+        'promedio_pasajeros': total_pasajeros / vuelos_con_pax if vuelos_con_pax else 0.0,
+    }
+
+
+def serie_mensual(cubo, valor='Vuelos'):
+    return cubo.groupby('Mes')[valor].sum().reset_index()
+
+
+def por_dimension(cubo, dimensiones, valor='Vuelos'):
+    # Suma `valor` por una o más dimensiones, de mayor a menor. Con una lista
+    # de valores se ordena por el primero.
+    suma = cubo.groupby(dimensiones, observed=True)[valor].sum()
+    if isinstance(valor, list):
+        return suma.sort_values(valor[0], ascending=False).reset_index()
+    return suma.sort_values(ascending=False).reset_index()
+
+# Consultas de rutas memorizadas por matriz; pasado eso se descartan las
+# usadas hace más tiempo.
+MAX_CONSULTAS_OD = 256
+
+
+def celdas_od(vuelos):
+    # Celdas de la matriz origen–destino: vuelos ('size') y pasajeros ('sum')
+    # por (mes, aerolínea, aeropuerto, origen/destino).
+    mes = vuelos['Fecha_UTC'].dt.to_period('M').dt.to_timestamp().rename('Mes')
+    return vuelos.groupby(
+        [mes, vuelos['Aerolinea_Nombre'], vuelos['Aeropuerto'], vuelos['Origen/Destino']],
+        observed=True,
+    )['PAX'].agg(['size', 'sum']).reset_index()
+
+
+class MatrizOD:
+    # Matriz origen–destino dispersa: una celda por (mes, aerolínea,
+    # aeropuerto, origen/destino) con vuelos, guardada como arreglos numpy
+    # con códigos enteros. Cada celda cuenta movimientos registrados en
+    # 'Aeropuerto' hacia o desde 'Origen/Destino', igual que el resto del
+    # dashboard. Las consultas filtran celdas (no vuelos) y se memorizan.
+    #
+    # Se arma desde celdas_od(vuelos), o desde las celdas de cada partición
+    # concatenadas: una celda repetida se suma en las consultas.
+
+    def __init__(self, celdas):
+        # Un único diccionario de aeropuertos para las dos puntas de la ruta.
+        self.aeropuertos = pd.Index(pd.concat([
+            celdas['Aeropuerto'].astype(str), celdas['Origen/Destino'].astype(str)
+        ]).unique()).sort_values()
+        self.aerolineas = pd.Index(celdas['Aerolinea_Nombre'].astype(str).unique()).sort_values()
+        self._mes = celdas['Mes'].to_numpy(dtype='datetime64[ns]')
+        self._aerolinea = self.aerolineas.get_indexer(celdas['Aerolinea_Nombre'].astype(str))
+        self._aeropuerto = self.aeropuertos.get_indexer(celdas['Aeropuerto'].astype(str))
+        self._otro = self.aeropuertos.get_indexer(celdas['Origen/Destino'].astype(str))
+        self._vuelos = celdas['size'].to_numpy(dtype=np.int64)
+        self._pax = celdas['sum'].to_numpy(dtype=np.int64)
+        # La matriz la comparten las sesiones y los hilos de la API.
+        self._consultas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._vuelos)
+
+    def _mascara(self, aeropuerto, aerolineas, desde, hasta):
+        mascara = np.ones(len(self), dtype=bool)
+        if aeropuerto is not None:
+            mascara &= self._aeropuerto == self.aeropuertos.get_indexer([aeropuerto])[0]
+        if aerolineas:
+            codigos = self.aerolineas.get_indexer(list(aerolineas))
+            mascara &= np.isin(self._aerolinea, codigos[codigos >= 0])
+        if desde is not None:
+            mascara &= self._mes >= np.datetime64(pd.Timestamp(desde).to_period('M').to_timestamp(), 'ns')
+        if hasta is not None:
+            mascara &= self._mes <= np.datetime64(pd.Timestamp(hasta).to_period('M').to_timestamp(), 'ns')
+        return mascara
+
+    def rutas(self, aeropuerto=None, aerolineas=None, desde=None, hasta=None, top=None):
+        # Rutas con sus vuelos y pasajeros, de mayor a menor. Con un
+        # aeropuerto, son sus rutas ('Aeropuerto' es siempre ese aeropuerto);
+        # sin él, toda la red con cada par de aeropuertos una sola vez.
+        clave = (aeropuerto, tuple(sorted(aerolineas or ())), desde, hasta, top)
+        with self._lock:
+            resultado = self._consultas.get(clave)
+            if resultado is not None:
+                self._consultas.move_to_end(clave)
+                return resultado
+
+        mascara = self._mascara(aeropuerto, aerolineas, desde, hasta)
+        a, b = self._aeropuerto[mascara], self._otro[mascara]
+        if aeropuerto is None:
+            a, b = np.minimum(a, b), np.maximum(a, b)
+        pares, inversa = np.unique(a.astype(np.int64) * len(self.aeropuertos) + b, return_inverse=True)
+        vuelos = np.bincount(inversa, weights=self._vuelos[mascara], minlength=len(pares))
+        pax = np.bincount(inversa, weights=self._pax[mascara], minlength=len(pares))
+
+        orden = np.argsort(-vuelos, kind='stable')
+        if top is not None:
+            orden = orden[:top]
+        pares = pares[orden]
+        resultado = pd.DataFrame({
+            'Aeropuerto': self.aeropuertos[pares // len(self.aeropuertos)],
+            'Origen/Destino': self.aeropuertos[pares % len(self.aeropuertos)],
+            'Vuelos': vuelos[orden].astype(np.int64),
+            'PAX': pax[orden].astype(np.int64),
+        })
+        with self._lock:
+            self._consultas[clave] = resultado
+            if len(self._consultas) > MAX_CONSULTAS_OD:
+                self._consultas.popitem(last=False)
+        return resultado
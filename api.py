@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+import threading
+import time
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from datos import BASE_PATH
+from agregados import DIMENSIONES_CUBO, filtrar_cubo, kpis
+from cache_compartida import CacheCompartida
+from dataset import DatosVuelos
+
+# API HTTP/JSON local sobre los mismos datos que el dashboard, cargados una
+# sola vez en memoria. Solo GET; los parámetros van en la consulta y las
+# listas separadas por comas:
+#
+#   /version
+#   /kpis?desde=2023-01&hasta=2023-12&aeropuertos=EZE,AER&aerolineas=...&tipos=...
+#   /agregados?por=Mes,Aeropuerto&valores=Vuelos,PAX&(filtros de /kpis)
+#   /rutas?aeropuerto=EZE&aerolineas=...&desde=...&hasta=...&top=10
+#   /vuelos?desde=2024-01-01&hasta=2024-01-31&aeropuertos=...&aerolineas=...
+#          &tipos=...&pagina=1&por_pagina=100&orden=PAX&descendente=1&columnas=...
+#   /aeropuertos?codigos=EZE,SABE,AEP      /aeropuertos/EZE
+#
+# En /kpis, /agregados y /rutas las fechas van por mes (como el cubo); en
+# /vuelos son días, ambos inclusive.
+
+PUERTO = 8502
+MAX_POR_PAGINA = 1000
+MAX_TOP = 500
+# Cada cuánto se revisa si cambiaron los archivos (segundos).
+INTERVALO_VERSION = 5
+# Presupuesto de la caché de respuestas, en MB.
+PRESUPUESTO_RESPUESTAS_MB = 64
+VALORES_CUBO = ['Vuelos', 'PAX', 'Vuelos_con_PAX']
+
+
+class ErrorConsulta(Exception):
+    def __init__(self, mensaje, estado=400):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+def _lista(parametros, nombre):
+    valor = parametros.get(nombre)
+    return [v for v in valor.split(',') if v] if valor else None
+
+
+def _entero(parametros, nombre, defecto):
+    try:
+        return int(parametros.get(nombre, defecto))
+    except ValueError:
+        raise ErrorConsulta(f"'{nombre}' debe ser un número entero") from None
+
+
+def _fecha(parametros, nombre):
+    valor = parametros.get(nombre)
+    if not valor:
+        return None
+    try:
+        return pd.Timestamp(valor)
+    except ValueError:
+        raise ErrorConsulta(f"'{nombre}' no es una fecha válida: {valor}") from None
+
+
+def _json(meta, tabla=None):
+    # Las tablas se serializan con pandas (fechas ISO, nulos como null) y se
+    # insertan en el resto de la respuesta sin pasar por objetos Python.
+    texto = json.dumps(meta, ensure_ascii=False, default=str)
+    if tabla is not None:
+        filas = tabla.to_json(orient='records', date_format='iso', force_ascii=False)
+        texto = texto[:-1] + ', "filas": ' + filas + '}'
+    return texto.encode('utf-8')
+
+
+class ServicioConsultas:
+    # Resuelve las consultas contra un DatosVuelos y guarda las respuestas ya
+    # serializadas en una caché LRU con la versión de los datos en la clave.
+
+    def __init__(self, directorio=BASE_PATH, presupuesto_mb=PRESUPUESTO_RESPUESTAS_MB):
+        self.directorio = directorio
+        self.respuestas = CacheCompartida(presupuesto_mb)
+        self._memoria = {}
+        self._datos = None
+        self._revisado = 0.0
+        self._lock = threading.Lock()
+
+    def datos(self):
+        # La versión se recalcula cada INTERVALO_VERSION segundos y no en cada
+        # consulta; si cambió, las respuestas viejas se descartan.
+        with self._lock:
+            if self._datos is None or time.monotonic() - self._revisado > INTERVALO_VERSION:
+                datos = DatosVuelos(self._memoria, self.directorio)
+                if self._datos is not None and datos.version != self._datos.version:
+                    self.respuestas.invalidar(lambda clave: clave[0] == datos.version)
+                self._datos, self._revisado = datos, time.monotonic()
+            return self._datos
+
+    def precargar(self):
+        self.datos().precargar()
+
+    def responder(self, ruta, parametros):
+        datos = self.datos()
+        clave = (datos.version, ruta, tuple(sorted(parametros.items())))
+        return self.respuestas.obtener(clave, lambda: self._resolver(datos, ruta, parametros))
+
+    def _resolver(self, datos, ruta, parametros):
+        partes = [p for p in ruta.split('/') if p]
+        if partes == ['version']:
+            return _json({'version': datos.version, 'informes': sorted(datos.informes)})
+        if partes == ['kpis']:
+            return _json({'version': datos.version, **kpis(self._cubo(datos, parametros))})
+        if partes == ['agregados']:
+            return self._agregados(datos, parametros)
+        if partes == ['rutas']:
+            return self._rutas(datos, parametros)
+        if partes == ['vuelos']:
+            return self._vuelos(datos, parametros)
+        if partes and partes[0] == 'aeropuertos' and len(partes) <= 2:
+            return self._aeropuertos(datos, partes[1:], parametros)
+        raise ErrorConsulta(f"No existe {ruta}", 404)
+
+    def _cubo(self, datos, parametros):
+        return filtrar_cubo(datos.cubo, _fecha(parametros, 'desde'), _fecha(parametros, 'hasta'),
+                            aeropuertos=_lista(parametros, 'aeropuertos'),
+                            aerolineas=_lista(parametros, 'aerolineas'),
+                            tipos=_lista(parametros, 'tipos'))
+
+    def _agregados(self, datos, parametros):
+        por = _lista(parametros, 'por') or ['Mes']
+        valores = _lista(parametros, 'valores') or ['Vuelos', 'PAX']
+        for nombre, elegidos, validos in (('por', por, DIMENSIONES_CUBO), ('valores', valores, VALORES_CUBO)):
+            invalidos = [v for v in elegidos if v not in validos]
+            if invalidos:
+                raise ErrorConsulta(f"'{nombre}' admite {', '.join(validos)}; no {', '.join(invalidos)}")
+        tabla = self._cubo(datos, parametros).groupby(por, observed=True)[valores].sum().reset_index()
+        return _json({'version': datos.version, 'total': len(tabla)}, tabla)
+
+    def _rutas(self, datos, parametros):
+        top = _entero(parametros, 'top', 20)
+        if top < 1:
+            raise ErrorConsulta("'top' debe ser mayor que 0")
+        tabla = datos.matriz_od.rutas(aeropuerto=parametros.get('aeropuerto'),
+                                      aerolineas=_lista(parametros, 'aerolineas'),
+                                      desde=_fecha(parametros, 'desde'), hasta=_fecha(parametros, 'hasta'),
+                                      top=min(top, MAX_TOP))
+        return _json({'version': datos.version, 'total': len(tabla)}, tabla)
+
+    def _vuelos(self, datos, parametros):
+        motor = datos.motor
+        hasta = _fecha(parametros, 'hasta')
+        filas = motor.filas(
+            desde=_fecha(parametros, 'desde'),
+            hasta=None if hasta is None else hasta + pd.Timedelta(days=1),
+            Aeropuerto=_lista(parametros, 'aeropuertos'),
+            Aerolinea_Nombre=_lista(parametros, 'aerolineas'),
+            Tipo_de_Movimiento=_lista(parametros, 'tipos'),
+        )
+        pagina = max(_entero(parametros, 'pagina', 1), 1)
+        por_pagina = min(max(_entero(parametros, 'por_pagina', 100), 1), MAX_POR_PAGINA)
+        columnas = _lista(parametros, 'columnas')
+        orden = parametros.get('orden')
+        for col in (columnas or []) + ([orden] if orden else []):
+            if col not in motor.vuelos.columns:
+                raise ErrorConsulta(f"No existe la columna {col}")
+        tabla = motor.pagina(filas, (pagina - 1) * por_pagina, por_pagina, columnas, orden,
+                             parametros.get('descendente', '0') not in ('0', 'false', ''))
+        return _json({'version': datos.version, 'total': len(filas), 'pagina': pagina,
+                      'por_pagina': por_pagina}, tabla)
+
+    def _aeropuertos(self, datos, codigo, parametros):
+        registro = datos.registro
+        if codigo:
+            fila = registro.buscar(codigo[0])
+            if fila is None:
+                raise ErrorConsulta(f"No se encontró el aeropuerto {codigo[0]}", 404)
+            return _json({'version': datos.version, 'aeropuerto': json.loads(fila.to_json(force_ascii=False))})
+        codigos = _lista(parametros, 'codigos')
+        if not codigos:
+            raise ErrorConsulta("Falta 'codigos'")
+        filas, faltantes = registro.buscar_varios(codigos)
+        return _json({'version': datos.version, 'faltantes': faltantes}, filas)
+
+
+ESTADOS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+async def _escribir(writer, estado, cuerpo, mantener):
+    encabezado = (f"HTTP/1.1 {estado} {ESTADOS[estado]}\r\n"
+                  "Content-Type: application/json; charset=utf-8\r\n"
+                  f"Content-Length: {len(cuerpo)}\r\n"
+                  f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n")
+    writer.write(encabezado.encode('ascii') + cuerpo)
+    await writer.drain()
+
+
+async def atender(servicio, reader, writer):
+    # Una conexión puede traer varias consultas (keep-alive). Las cuentas
+    # corren en hilos aparte para que el bucle siga aceptando conexiones; las
+    # respuestas en caché se devuelven sin esperar a nadie.
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                encabezado = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lineas = encabezado.decode('latin-1').split('\r\n')
+            partes = lineas[0].split(' ')
+            if len(partes) != 3:
+                return
+            metodo, destino, protocolo = partes
+            encabezados = {k.strip().lower(): v.strip() for k, _, v in (l.partition(':') for l in lineas[1:] if l)}
+            mantener = encabezados.get('connection', '').lower() != 'close' and protocolo == 'HTTP/1.1'
+
+            if metodo != 'GET':
+                await _escribir(writer, 405, _json({'error': "Solo se admite GET"}), mantener)
+            else:
+                url = urlsplit(destino)
+                parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    cuerpo = await loop.run_in_executor(None, servicio.responder, unquote(url.path), parametros)
+                    estado = 200
+                except ErrorConsulta as e:
+                    estado, cuerpo = e.estado, _json({'error': str(e)})
+                except Exception as e:
+                    estado, cuerpo = 500, _json({'error': str(e)})
+                await _escribir(writer, estado, cuerpo, mantener)
+            if not mantener:
+                return
+    finally:
+        writer.close()
+
+
+async def servir(servicio, host='127.0.0.1', puerto=PUERTO):
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, servicio.precargar)
+    servidor = await asyncio.start_server(lambda r, w: atender(servicio, r, w), host, puerto)
+    print(f"API escuchando en http://{host}:{puerto} (datos {servicio.datos().version})")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP/JSON local sobre los datos del dashboard.")
+    parser.add_argument('--datos', default=BASE_PATH, help="directorio con los informes (por defecto %(default)s)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=PUERTO)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(servir(ServicioConsultas(args.datos), args.host, args.puerto))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
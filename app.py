@@ -1,64 +1,128 @@
 import streamlit as st
 import pandas as pd
 from streamlit_option_menu import option_menu
-from datetime import datetime
-import pytz
 import os
-import time
-import threading
-import folium
-from streamlit_folium import folium_static
-from folium.plugins import MarkerCluster
-from streamlit_option_menu import option_menu
-import plotly.express as px
-from streamlit_folium import folium_static
-import folium
-
-def cargar_datos():
-    archivos = {        
-        'aeropuertos': 'aeropuertos_detalle.csv',
-        '2019': '2019_informe_ministerio.csv',
-        '2020': '2020_informe_ministerio.csv',
-        '2021': '202112_informe_ministerio.csv',
-        '2022': '202212-informe-ministerio.csv',
-        '2023': '202312-informe-ministerio.csv',
-        '2024': '202405-informe-ministerio.csv'
-    }
-    base_path = 'data/'
-    datos = {}
-    for key, filename in archivos.items():
-        full_path = os.path.join(base_path, filename)
-        try:
-            df = pd.read_csv(full_path, delimiter=';', dayfirst=True)
-            df.columns = df.columns.str.strip()  
-            df.columns = [col.replace(' ', '_') for col in df.columns]  
-            datos[key] = df
-        except Exception as e:
-            st.error(f"Error al cargar {filename}: {str(e)}")
-            datos[key] = pd.DataFrame()  
-    return datos
-
-def analizar_por_aerolinea(datos):
+import math
+import streamlit.components.v1 as components
+import precarga
+from agregados import filtrar_cubo, kpis, por_dimension, serie_mensual
+from aeropuertos import marcadores_aeropuertos
+from datos import BASE_PATH
+from dataset import DatosVuelos, derivado
+from graficos import NOMBRES_BALDE, elegir_balde, serie_por_balde
+from cache_compartida import CACHE
+from instrumentacion import corrida, etapa, registrar_medidores, rss_mb
+
+# Los marcadores se crean en el navegador a partir de un único arreglo.
+CALLBACK_MARCADOR = """
+var callback = function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'info-sign', markerColor: 'blue', prefix: 'glyphicon'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2]);
+    marker.bindTooltip(row[3]);
+    return marker;
+};
+"""
+
+# folium, streamlit_folium y plotly se importan dentro de las funciones y
+# pestañas que los usan: así no demoran la primera ejecución, y la precarga
+# los importa en segundo plano.
+
+def mapa_aeropuertos_html(registro):
+    import folium
+    from folium.plugins import FastMarkerCluster
+    with etapa('folium_render', filas=len(registro.tabla)):
+        m = folium.Map(location=[-34.61315, -58.37723], zoom_start=5, tiles='cartodb positron')
+        FastMarkerCluster(marcadores_aeropuertos(registro.tabla), callback=CALLBACK_MARCADOR).add_to(m)
+        return m.get_root().render()
+
+class DatosDashboard(DatosVuelos):
+    # Los datos del dashboard más lo que solo usa la interfaz.
+    @derivado
+    def mapa_aeropuertos(self):
+        return mapa_aeropuertos_html(self.registro)
+
+FILAS_POR_PAGINA = 50
+
+def tabla_paginada(clave, motor, filas, columnas=None):
+    # Tabla de las filas indicadas (posiciones del motor de filtros) que
+    # manda al navegador solo la página actual. En la sesión quedan la
+    # página, el orden y las columnas elegidas, con claves que empiezan por
+    # `clave`; el total de filas es el largo de `filas`, sin contar nada.
+    todas = list(motor.vuelos.columns)
+    total = len(filas)
+    paginas = max(1, math.ceil(total / FILAS_POR_PAGINA))
+    if st.session_state.get(f"{clave}_pagina", 1) > paginas:
+        st.session_state[f"{clave}_pagina"] = paginas
+
+    col1, col2, col3, col4 = st.columns([4, 2, 1, 1])
+    columnas = col1.multiselect("Columnas", todas, default=columnas or todas, key=f"{clave}_columnas")
+    orden = col2.selectbox("Ordenar por", [None] + todas, format_func=lambda c: "Sin ordenar" if c is None else c, key=f"{clave}_orden")
+    descendente = col3.checkbox("Descendente", key=f"{clave}_descendente")
+    pagina = col4.number_input("Página", min_value=1, max_value=paginas, step=1, key=f"{clave}_pagina")
+
+    inicio = (pagina - 1) * FILAS_POR_PAGINA
+    with etapa(f'tabla {clave}') as medicion:
+        pagina_actual = motor.pagina(filas, inicio, FILAS_POR_PAGINA, columnas or todas, orden, descendente)
+        st.dataframe(pagina_actual)
+        medicion.filas = len(pagina_actual)
+    st.caption(f"Filas {min(inicio + 1, total):,}–{min(inicio + FILAS_POR_PAGINA, total):,} de {total:,} · página {pagina} de {paginas}")
+
+def mostrar_grafico(ds, vista, parametros, construir, **opciones):
+    import plotly.io as pio
+    # La figura se arma una vez por (vista, filtros, balde) y se guarda como
+    # JSON en la caché compartida; las demás veces solo se lee.
+    with etapa(f'grafico {vista}'):
+        figura = pio.from_json(ds.consulta('grafico', (vista,) + tuple(parametros), lambda: construir().to_json()))
+    with etapa('plotly_chart'):
+        st.plotly_chart(figura, **opciones)
+
+def mostrar_figura(nombre, construir, **opciones):
+    # Se mide por separado el armado de la figura con Plotly y su envío.
+    with etapa(f'figura {nombre}'):
+        figura = construir()
+    with etapa('plotly_chart'):
+        st.plotly_chart(figura, **opciones)
+
+def mostrar_mapa(m):
+    from streamlit_folium import folium_static
+    with etapa('folium_static'):
+        folium_static(m)
+
+def mostrar_normalizacion(normalizaciones):
+    with st.expander("🔧 Normalización de columnas por año"):
+        for year, normalizacion in normalizaciones.items():
+            mapeadas = ', '.join(f"{origen} → {destino}" for origen, destino in normalizacion['mapeadas'].items())
+            st.markdown(f"**{year}**")
+            st.write(f"Mapeadas: {mapeadas or '-'}")
+            st.write(f"Descartadas: {', '.join(normalizacion['descartadas']) or '-'}")
+            st.write(f"Faltantes: {', '.join(normalizacion['faltantes']) or '-'}")
+
+def analizar_por_aerolinea(ds):
+    import plotly.express as px
     st.header("✈ Análisis por Aerolínea")
+    motor = ds.motor
+    # El último informe cargado: los años se descubren en el directorio.
+    anio = max(ds.informes)
+    cubo_anio = filtrar_cubo(ds.cubo, desde=f'{anio}-01-01', hasta=f'{anio}-12-31')
     
     # Airline selection
-    aerolineas = datos['2024']['Aerolinea_Nombre'].unique().tolist()
+    aerolineas = cubo_anio['Aerolinea_Nombre'].dropna().unique().tolist()
     aerolineas.insert(0, "Todas")
     aerolinea_seleccionada = st.multiselect("Selecciona una o más Aerolíneas", aerolineas, default="Todas")
     
     if "Todas" in aerolinea_seleccionada:
-        datos_aerolinea = datos['2024']
+        cubo_aerolinea = cubo_anio
+        filas_aerolinea = ds.filas_anio(anio)
     else:
-        datos_aerolinea = datos['2024'][datos['2024']['Aerolinea_Nombre'].isin(aerolinea_seleccionada)]
-
-    if 'Fecha_UTC' not in datos_aerolinea.columns:
-        st.error("La columna 'Fecha UTC' no está disponible en los datos.")
-        return
+        cubo_aerolinea = filtrar_cubo(cubo_anio, aerolineas=aerolinea_seleccionada)
+        filas_aerolinea = ds.filas_anio(anio, motor.filas(Aerolinea_Nombre=aerolinea_seleccionada))
 
     st.subheader("📊 KPIs")
-    total_vuelos = len(datos_aerolinea)
-    total_pasajeros = datos_aerolinea['Pasajeros'].sum()
-    promedio_pasajeros = datos_aerolinea['Pasajeros'].mean()
+    indicadores = kpis(cubo_aerolinea)
+    total_vuelos = indicadores['total_vuelos']
+    total_pasajeros = indicadores['total_pasajeros']
+    promedio_pasajeros = indicadores['promedio_pasajeros']
     
     col1, col2, col3 = st.columns(3)
     col1.metric("Total de Vuelos", total_vuelos)
@@ -66,56 +130,122 @@ def analizar_por_aerolinea(datos):
     col3.metric("Promedio de Pasajeros por Vuelo", round(promedio_pasajeros, 2))
 
     st.subheader("📅 Vuelos por Mes")
-    datos_aerolinea['Fecha_UTC'] = pd.to_datetime(datos_aerolinea['Fecha_UTC'], dayfirst=True)
-    datos_aerolinea['Mes'] = datos_aerolinea['Fecha_UTC'].dt.to_period('M').astype(str)
-    vuelos_por_mes = datos_aerolinea.groupby('Mes').size().reset_index(name='Vuelos')
-    fig_vuelos_mes = px.line(vuelos_por_mes, x='Mes', y='Vuelos', title=f"Vuelos por Mes para {', '.join(aerolinea_seleccionada)}", markers=True)
-    st.plotly_chart(fig_vuelos_mes)
+    vuelos_por_mes = serie_mensual(cubo_aerolinea)
+    mostrar_figura('aerolinea_vuelos_mes', lambda: px.line(vuelos_por_mes, x='Mes', y='Vuelos', title=f"Vuelos por Mes para {', '.join(aerolinea_seleccionada)}", markers=True))
 
     st.subheader("🧍‍♂ Pasajeros por Vuelo")
-    fig_pasajeros_vuelo = px.bar(datos_aerolinea, x='Fecha_UTC', y='Pasajeros', title=f"Pasajeros por Vuelo para {', '.join(aerolinea_seleccionada)}", color='Pasajeros')
-    st.plotly_chart(fig_pasajeros_vuelo)
+    # Un punto por balde de tiempo (promedio de pasajeros por vuelo), no uno
+    # por vuelo; el balde depende del rango de fechas que se muestra.
+    balde = elegir_balde(*motor.rango_fechas(filas_aerolinea))
+
+    def figura_pasajeros_vuelo():
+        serie = serie_por_balde(motor.vista(filas_aerolinea, ['Fecha_UTC', 'PAX']), 'Fecha_UTC', 'PAX', balde)
+        return px.bar(serie, x='Fecha_UTC', y='PAX', title=f"Pasajeros por Vuelo para {', '.join(aerolinea_seleccionada)} (promedio por {NOMBRES_BALDE[balde]})", color='PAX')
+
+    mostrar_grafico(ds, 'pasajeros_vuelo_aerolinea', (anio, tuple(sorted(aerolinea_seleccionada)), balde), figura_pasajeros_vuelo)
     
     st.subheader("📋 Tabla Detallada de Vuelos")
-    st.dataframe(datos_aerolinea)
-def get_aeropuerto_details(aeropuertos_df, aeropuerto_code):
-    # Filtra los datos para encontrar el aeropuerto con el código dado
-    filtro = aeropuertos_df[aeropuertos_df['local'] == aeropuerto_code]
-    
-    if not filtro.empty:
-        return filtro.iloc[0]
-    else:
+    tabla_paginada("aerolinea", motor, filas_aerolinea)
+def mapa_rutas(registro, rutas, centro=None):
+    # Una línea por ruta, con el grosor proporcional a la cantidad de vuelos.
+    with etapa('mapa_rutas', filas=len(rutas)):
+        return _mapa_rutas(registro, rutas, centro)
+
+def _mapa_rutas(registro, rutas, centro):
+    import folium
+    codigos = pd.unique(pd.concat([rutas['Aeropuerto'], rutas['Origen/Destino']]))
+    ubicaciones, sin_ubicacion = registro.coordenadas(codigos)
+    ubicaciones = ubicaciones.set_index('codigo')[['lat', 'lon', 'denominacion']]
+    tramos = rutas.join(ubicaciones, on='Aeropuerto').join(ubicaciones, on='Origen/Destino', rsuffix='_destino').dropna(subset=['lat', 'lat_destino'])
+
+    m = folium.Map(location=centro or [-34.61315, -58.37723], zoom_start=5 if centro is None else 6, tiles='cartodb positron')
+    maximo = tramos['Vuelos'].max() if not tramos.empty else 1
+    for tramo in tramos.itertuples(index=False):
+        descripcion = f"{tramo.denominacion} – {tramo.denominacion_destino}: {tramo.Vuelos:,} vuelos, {tramo.PAX:,} pasajeros"
+        folium.PolyLine(
+            locations=[[tramo.lat, tramo.lon], [tramo.lat_destino, tramo.lon_destino]],
+            weight=1 + 9 * tramo.Vuelos / maximo,
+            color='#1E90FF',
+            opacity=0.7,
+            tooltip=descripcion,
+        ).add_to(m)
+    return m, sin_ubicacion
+
+def get_aeropuerto_details(registro, aeropuerto_code):
+    # Busca el aeropuerto por código local, OACI o IATA
+    detalles = registro.buscar(aeropuerto_code)
+    if detalles is None:
         st.warning(f"No se encontró el aeropuerto con el código: {aeropuerto_code}")
+    return detalles
+
+def get_aeropuerto_name(registro, aeropuerto_code):
+    detalles = registro.buscar(aeropuerto_code)
+    return aeropuerto_code if detalles is None else detalles['denominacion']
+# Intervalo de muestreo del perfilador cuando se activa desde el panel.
+PERFIL_MS = 10
+
+# Estado de la caché compartida en las métricas exportadas a Prometheus.
+registrar_medidores('cache', lambda: {f'pf_cache_{nombre}': valor for nombre, valor in CACHE.estadisticas().items()})
+
+def panel_depuracion(ejecucion):
+    # Tiempos de la ejecución actual, para encontrar qué etapa la hace lenta.
+    if not st.sidebar.checkbox("⏱ Mostrar tiempos", key='depuracion'):
+        return
+    with st.sidebar.expander("Tiempos de esta ejecución", expanded=True):
+        st.dataframe(ejecucion.tabla(), hide_index=True)
+        st.caption(f"Total {ejecucion.transcurrido * 1000:,.0f} ms · memoria residente {rss_mb():,.0f} MB")
+        cache = CACHE.estadisticas()
+        st.caption(f"Caché: {cache['entradas']} entradas, {cache['ocupado_mb']:,.0f} de {cache['presupuesto_mb']:,.0f} MB, "
+                   f"{cache['tasa_aciertos']:.0%} de aciertos")
+        st.checkbox("Perfilar ejecuciones lentas", key='perfilar',
+                    help="Muestrea la pila durante cada ejecución y guarda el perfil de las que tardan más de lo normal.")
+        if st.session_state.get('ultimo_perfil'):
+            st.caption(f"Último perfil: {st.session_state['ultimo_perfil']}")
 
-def get_aeropuerto_name(aeropuertos_df, aeropuerto_code):
-    return get_aeropuerto_details(aeropuertos_df, aeropuerto_code)['denominacion']
 def main():
-    datos = cargar_datos()
-    if 'aeropuertos' in datos:
-        aeropuertos = datos['aeropuertos']
-    else:
-        st.error("No se encontraron datos de aeropuertos.")
-    all_years_data = pd.concat([datos[year] for year in ['2019', '2020', '2021', '2022', '2023', '2024']], ignore_index=True)
-    all_years_data['Fecha_UTC'] = pd.to_datetime(all_years_data['Fecha_UTC'], dayfirst=True)
-    all_years_data['PAX'] = pd.to_numeric(all_years_data['PAX'], errors='coerce')
-    filtered_data = all_years_data[all_years_data['Fecha_UTC'] >= '2019-01-01']
-    all_years_data['Mes'] = all_years_data['Fecha_UTC'].dt.to_period('M')
-    pasajeros_por_mes = filtered_data.groupby(filtered_data['Fecha_UTC'].dt.to_period('M'))['PAX'].sum().reset_index()
-    pasajeros_por_mes['Fecha_UTC'] = pasajeros_por_mes['Fecha_UTC'].dt.to_timestamp()
-
-    pasajeros_por_aerolinea = filtered_data.groupby('Aerolinea_Nombre')['PAX'].sum().reset_index()
+    # El perfilador se activa desde el panel y rige a partir de la ejecución
+    # siguiente; con PERFILADOR_MS queda activo siempre.
+    with corrida(perfilar_ms=PERFIL_MS if st.session_state.get('perfilar') else None) as ejecucion:
+        mostrar_pagina(ejecucion)
+        panel_depuracion(ejecucion)
+    if ejecucion.perfil:
+        st.session_state['ultimo_perfil'] = ejecucion.perfil
+
+# Pestañas que no tienen nada que mostrar sin informes de vuelos.
+PESTANAS_CON_VUELOS = ["General", "Análisis por año", "Análisis por Aerolinea", "Análisis por Aeropuerto",
+                       "Análisis de Rutas", "Análisis de Pasajeros"]
+
+def mostrar_pagina(ejecucion):
+    # Sin el lanzador (servidor.py) la precarga arranca con la primera sesión;
+    # las siguientes llamadas no hacen nada.
+    precarga.iniciar()
+    ds = DatosDashboard(st.session_state.setdefault('dataset', {}))
     with st.sidebar:
         selection = option_menu(
             "Navegación",
              ["Introducción", "General", "Análisis por año", "Análisis por Aerolinea","Análisis por Aeropuerto",
-             "Análisis de Pasajeros","Mapas Interactivos", "Acerca de"],
+             "Análisis de Rutas", "Análisis de Pasajeros","Mapas Interactivos", "Acerca de"],
             icons=["house", "file-earmark-text", "clock", 
-                   "airplane", "clipboard","people", "map","checkbox"],
+                   "airplane", "clipboard", "signpost-split", "people", "map","checkbox"],
             menu_icon="cast",
             default_index=0,
         )
+    ejecucion.nombre = selection
+
+    # Los avisos de carga van antes del contenido, para que se vean aunque la
+    # pestaña falle. El resumen de los informes no carga los vuelos y trae
+    # los errores de cada uno, pero convierte los informes pendientes: solo
+    # se pide en las pestañas que lo usan o que cargan los vuelos igual; en
+    # las demás los errores salen de la cache, sin convertir nada.
+    if not ds.informes:
+        st.warning(f"No se encontraron informes de vuelos en {os.path.abspath(BASE_PATH)}.")
+    elif selection == "Introducción" or selection in PESTANAS_CON_VUELOS:
+        ds.resumen_informes
+    for key, error in ds.errores().items():
+        st.sidebar.error(f"Error al cargar {os.path.basename(ds.rutas[key])}: {error}")
+    if not ds.informes and selection in PESTANAS_CON_VUELOS:
+        return
 
-   
     if selection == "Introducción":
                  # Título y subtítulo con estilos CSS
         st.markdown("<h1 style='text-align: center; color: #4CAF50;'>Dashboard de Análisis de Vuelos ✈</h1>", unsafe_allow_html=True)
@@ -124,8 +254,8 @@ def main():
         st.write("## 📊 Resumen de Datos por Dataset")
         total_datos = 0
         cuadros_datos = []
-        for year, df in datos.items():
-            num_datos = df.shape[0]
+        filas_por_anio, normalizaciones, _ = ds.resumen_informes
+        for year, num_datos in {'aeropuertos': len(ds.aeropuertos), **{year: filas_por_anio.get(year, 0) for year in ds.informes}}.items():
             total_datos += num_datos
             cuadros_datos.append((year, num_datos))
 
@@ -170,6 +300,8 @@ def main():
 
         st.markdown("<div style='height: 20px;'></div>", unsafe_allow_html=True)
 
+        mostrar_normalizacion(normalizaciones)
+
         st.write("## 📈 Total de Datos Cargados")
         st.markdown("<div style='display: flex; justify-content: center;'>"
                     f"<div class='metric'><h2>🔢 Total de Datos</h2><div class='value'>{total_datos}</div></div>"
@@ -192,10 +324,14 @@ def main():
             """, unsafe_allow_html=True)
 
     elif selection == "General":
-        total_vuelos = all_years_data['Fecha_UTC'].count()
-        total_pasajeros = all_years_data['PAX'].sum()
-        promedio_pasajeros = all_years_data['PAX'].mean()
-        num_aeropuertos = datos['aeropuertos']['local'].nunique()
+        import plotly.express as px
+        cubo = ds.cubo
+        motor = ds.motor
+        indicadores = kpis(cubo)
+        total_vuelos = indicadores['total_vuelos']
+        total_pasajeros = indicadores['total_pasajeros']
+        promedio_pasajeros = indicadores['promedio_pasajeros']
+        num_aeropuertos = ds.aeropuertos['local'].nunique()
 
         st.markdown("""
             <style>
@@ -257,244 +393,275 @@ def main():
 
         st.subheader("Gráficos Principales")
 
-        vuelos_por_mes = all_years_data.groupby('Mes').size()
-        vuelos_por_mes.index = vuelos_por_mes.index.astype(str)
-        fig_line = px.line(vuelos_por_mes, title="Vuelos por Mes", labels={'index': 'Mes', 'value': 'Número de Vuelos'})
-        fig_line.update_layout(plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Mes', yaxis_title='Número de Vuelos')
-        fig_line.update_traces(line=dict(color='#1E90FF'))
-        st.plotly_chart(fig_line, use_container_width=True)
+        vuelos_por_mes = serie_mensual(cubo)
+
+        def figura_vuelos_mes():
+            fig_line = px.line(vuelos_por_mes, x='Mes', y='Vuelos', title="Vuelos por Mes", labels={'Vuelos': 'Número de Vuelos'})
+            fig_line.update_layout(plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Mes', yaxis_title='Número de Vuelos')
+            fig_line.update_traces(line=dict(color='#1E90FF'))
+            return fig_line
 
-        vuelos_por_aerolinea = all_years_data['Aerolinea_Nombre'].value_counts().reset_index()
+        mostrar_figura('general_vuelos_mes', figura_vuelos_mes, use_container_width=True)
+
+        vuelos_por_aerolinea = por_dimension(cubo, 'Aerolinea_Nombre')
         vuelos_por_aerolinea.columns = ['Aerolinea', 'Vuelos']
-        fig_bar_vuelos = px.bar(vuelos_por_aerolinea, x='Aerolinea', y='Vuelos', title="Vuelos por Aerolínea", labels={'Aerolinea': 'Aerolínea', 'Vuelos': 'Número de Vuelos'})
-        fig_bar_vuelos.update_layout(xaxis={'categoryorder': 'total descending'}, plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Aerolínea', yaxis_title='Número de Vuelos')
-        fig_bar_vuelos.update_traces(marker_color='#1E90FF')
-        fig_bar_vuelos.update_layout(barmode='stack', bargap=0.2)
-        st.plotly_chart(fig_bar_vuelos, use_container_width=True)
-
-        pasajeros_por_aerolinea = all_years_data.groupby(['Aerolinea_Nombre', 'Tipo_de_Movimiento'])['PAX'].sum().reset_index()
-        fig_bar_pasajeros = px.bar(pasajeros_por_aerolinea, x='Aerolinea_Nombre', y='PAX', color='Tipo_de_Movimiento', title="Pasajeros por Aerolínea y Tipo de Movimiento", labels={'Aerolinea_Nombre': 'Aerolínea', 'PAX': 'Número de Pasajeros'})
-        fig_bar_pasajeros.update_layout(xaxis={'categoryorder': 'total descending'}, plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Aerolínea', yaxis_title='Número de Pasajeros')
-        fig_bar_pasajeros.update_layout(barmode='stack', bargap=0.2)
-        st.plotly_chart(fig_bar_pasajeros, use_container_width=True)
-
-        tipo_movimiento = all_years_data['Tipo_de_Movimiento'].value_counts().reset_index()
+
+        def figura_vuelos_aerolinea():
+            fig_bar_vuelos = px.bar(vuelos_por_aerolinea, x='Aerolinea', y='Vuelos', title="Vuelos por Aerolínea", labels={'Aerolinea': 'Aerolínea', 'Vuelos': 'Número de Vuelos'})
+            fig_bar_vuelos.update_layout(xaxis={'categoryorder': 'total descending'}, plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Aerolínea', yaxis_title='Número de Vuelos')
+            fig_bar_vuelos.update_traces(marker_color='#1E90FF')
+            fig_bar_vuelos.update_layout(barmode='stack', bargap=0.2)
+            return fig_bar_vuelos
+
+        mostrar_figura('general_vuelos_aerolinea', figura_vuelos_aerolinea, use_container_width=True)
+
+        pasajeros_por_aerolinea = por_dimension(cubo, ['Aerolinea_Nombre', 'Tipo_de_Movimiento'], 'PAX')
+
+        def figura_pasajeros_aerolinea():
+            fig_bar_pasajeros = px.bar(pasajeros_por_aerolinea, x='Aerolinea_Nombre', y='PAX', color='Tipo_de_Movimiento', title="Pasajeros por Aerolínea y Tipo de Movimiento", labels={'Aerolinea_Nombre': 'Aerolínea', 'PAX': 'Número de Pasajeros'})
+            fig_bar_pasajeros.update_layout(xaxis={'categoryorder': 'total descending'}, plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF', xaxis_title='Aerolínea', yaxis_title='Número de Pasajeros')
+            fig_bar_pasajeros.update_layout(barmode='stack', bargap=0.2)
+            return fig_bar_pasajeros
+
+        mostrar_figura('general_pasajeros_aerolinea', figura_pasajeros_aerolinea, use_container_width=True)
+
+        tipo_movimiento = por_dimension(cubo, 'Tipo_de_Movimiento')
         tipo_movimiento.columns = ['Tipo_de_Movimiento', 'count']
-        fig_doughnut = px.pie(tipo_movimiento, values='count', names='Tipo_de_Movimiento', title="Distribución de Tipo de Movimiento", hole=0.3)
-        fig_doughnut.update_layout(plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF')
-        fig_doughnut.update_traces(marker=dict(colors=['#FF6384', '#36A2EB', '#FFCE56']))
-        st.plotly_chart(fig_doughnut, use_container_width=True)
+
+        def figura_tipo_movimiento():
+            fig_doughnut = px.pie(tipo_movimiento, values='count', names='Tipo_de_Movimiento', title="Distribución de Tipo de Movimiento", hole=0.3)
+            fig_doughnut.update_layout(plot_bgcolor='#2B2B2B', paper_bgcolor='#2B2B2B', font_color='#FFFFFF')
+            fig_doughnut.update_traces(marker=dict(colors=['#FF6384', '#36A2EB', '#FFCE56']))
+            return fig_doughnut
+
+        mostrar_figura('general_tipo_movimiento', figura_tipo_movimiento, use_container_width=True)
 
         st.subheader("Filtros")
-        fecha_min = all_years_data['Fecha_UTC'].min().date()
-        fecha_max = all_years_data['Fecha_UTC'].max().date()
+        fecha_min, fecha_max = (f.date() for f in motor.rango_fechas())
         fecha = st.date_input("Seleccionar rango de fechas", value=[fecha_min, fecha_max], min_value=fecha_min, max_value=fecha_max)
 
-        aeropuertos = ['Todos'] + list(all_years_data['Aeropuerto'].unique())
-        aerolineas = ['Todos'] + list(all_years_data['Aerolinea_Nombre'].unique())
-        tipos_movimiento = ['Todos'] + list(all_years_data['Tipo_de_Movimiento'].unique())
+        aeropuertos = ['Todos'] + motor.opciones('Aeropuerto')
+        aerolineas = ['Todos'] + motor.opciones('Aerolinea_Nombre')
+        tipos_movimiento = ['Todos'] + motor.opciones('Tipo_de_Movimiento')
 
         aeropuerto = st.selectbox("Seleccionar Aeropuerto (Origen/Destino)", aeropuertos)
         aerolinea = st.selectbox("Seleccionar Aerolínea", aerolineas)
         tipo_movimiento = st.selectbox("Seleccionar Tipo de Movimiento", tipos_movimiento)
 
-        datos_filtrados = all_years_data[
-            (all_years_data['Fecha_UTC'] >= pd.to_datetime(fecha[0])) & 
-            (all_years_data['Fecha_UTC'] <= pd.to_datetime(fecha[1]))
-        ]
-
-        if aeropuerto != 'Todos':
-            datos_filtrados = datos_filtrados[datos_filtrados['Aeropuerto'] == aeropuerto]
-
-        if aerolinea != 'Todos':
-            datos_filtrados = datos_filtrados[datos_filtrados['Aerolinea_Nombre'] == aerolinea]
-
-        if tipo_movimiento != 'Todos':
-            datos_filtrados = datos_filtrados[datos_filtrados['Tipo_de_Movimiento'] == tipo_movimiento]
+        filas = motor.filas(
+            desde=pd.to_datetime(fecha[0]),
+            hasta=pd.to_datetime(fecha[-1]) + pd.Timedelta(days=1),
+            Aeropuerto=None if aeropuerto == 'Todos' else aeropuerto,
+            Aerolinea_Nombre=None if aerolinea == 'Todos' else aerolinea,
+            Tipo_de_Movimiento=None if tipo_movimiento == 'Todos' else tipo_movimiento,
+        )
 
         # Detailed Table
         st.subheader("Tabla Detallada")
-        st.dataframe(datos_filtrados)
+        tabla_paginada("general", motor, filas)
 
         
     elif selection == "Análisis por año":
+        import plotly.express as px
         st.title("Análisis por Año")
 
-        year = st.selectbox("Seleccionar Año", ["2019", "2020", "2021", "2022", "2023", "2024"])
+        year = st.selectbox("Seleccionar Año", list(ds.informes))
 
-        df_year = datos[year]
+        df_year = ds.datos[year]
+        motor = ds.motor
 
         if not df_year.empty:
             total_vuelos = df_year.shape[0]
-            total_pasajeros = df_year['Pasajeros'].sum()
-
-            if 'Tipo_de_Movimiento' in df_year.columns:
-                total_aterrizajes = df_year[df_year['Tipo_de_Movimiento'] == 'Aterrizaje'].shape[0]
-                total_despegues = df_year[df_year['Tipo_de_Movimiento'] == 'Despegue'].shape[0]
-            else:
-                total_aterrizajes = 0
-                total_despegues = 0
+            total_pasajeros = df_year['PAX'].sum()
+            total_aterrizajes = (df_year['Tipo_de_Movimiento'] == 'Aterrizaje').sum()
+            total_despegues = (df_year['Tipo_de_Movimiento'] == 'Despegue').sum()
 
             st.metric("Total Vuelos", total_vuelos)
             st.metric("Total Pasajeros", total_pasajeros)
             st.metric("Total Aterrizajes", total_aterrizajes)
             st.metric("Total Despegues", total_despegues)
 
-            if 'Fecha' in df_year.columns:
-                df_year['Mes'] = pd.to_datetime(df_year['Fecha'], errors='coerce').dt.month
-                vuelos_por_mes = df_year.groupby('Mes').size().reset_index(name='Vuelos')
-                fig_line = px.line(vuelos_por_mes, x='Mes', y='Vuelos', title="Vuelos por Mes en el Año Seleccionado")
-                st.plotly_chart(fig_line)
+            with etapa('vuelos_por_mes_anio', filas=len(df_year)):
+                vuelos_por_mes = df_year.groupby(df_year['Fecha_UTC'].dt.month.rename('Mes')).size().reset_index(name='Vuelos')
+            mostrar_figura('anio_vuelos_mes', lambda: px.line(vuelos_por_mes, x='Mes', y='Vuelos', title="Vuelos por Mes en el Año Seleccionado"))
 
-            if 'Aerolínea_Nombre' in df_year.columns:
-                vuelos_por_aerolinea = df_year['Aerolínea_Nombre'].value_counts().reset_index()
+            with etapa('vuelos_por_aerolinea_anio', filas=len(df_year)):
+                vuelos_por_aerolinea = df_year.groupby('Aerolinea_Nombre', observed=True).size().sort_values(ascending=False).reset_index()
                 vuelos_por_aerolinea.columns = ['Aerolínea', 'Vuelos']
-                fig_bar = px.bar(vuelos_por_aerolinea, x='Aerolínea', y='Vuelos', title="Vuelos por Aerolínea en el Año Seleccionado")
-                st.plotly_chart(fig_bar)
+            mostrar_figura('anio_vuelos_aerolinea', lambda: px.bar(vuelos_por_aerolinea, x='Aerolínea', y='Vuelos', title="Vuelos por Aerolínea en el Año Seleccionado"))
 
-            st.dataframe(df_year)
+            filas_anio = ds.filas_anio(year)
+            tabla_paginada("anio", motor, filas_anio)
 
             # Filters
-            if 'Aerolínea_Nombre' in df_year.columns:
-                aerolinea_filter = st.multiselect("Filtrar por Aerolínea", options=df_year['Aerolínea_Nombre'].unique())
-            else:
-                aerolinea_filter = []
+            desde, hasta = pd.Timestamp(f"{year}-01-01"), pd.Timestamp(f"{int(year) + 1}-01-01")
+            aerolinea_filter = st.multiselect("Filtrar por Aerolínea", options=motor.opciones('Aerolinea_Nombre', desde, hasta))
+            aeropuerto_filter = st.multiselect("Filtrar por Aeropuerto", options=motor.opciones('Aeropuerto', desde, hasta))
 
-            if 'Aeropuerto' in df_year.columns:
-                aeropuerto_filter = st.multiselect("Filtrar por Aeropuerto", options=df_year['Aeropuerto'].unique())
-            else:
-                aeropuerto_filter = []
-
-            if aerolinea_filter:
-                df_year = df_year[df_year['Aerolínea_Nombre'].isin(aerolinea_filter)]
-            if aeropuerto_filter:
-                df_year = df_year[df_year['Aeropuerto'].isin(aeropuerto_filter)]
+            if aerolinea_filter or aeropuerto_filter:
+                filas_anio = motor.filas(desde, hasta, Aerolinea_Nombre=aerolinea_filter, Aeropuerto=aeropuerto_filter)
 
-            st.dataframe(df_year)
+            tabla_paginada("anio_filtrado", motor, filas_anio)
 
         else:
             st.warning("No hay datos disponibles para el año seleccionado.")
 
     elif selection == "Análisis por Aerolinea":
-        analizar_por_aerolinea(datos)
+        analizar_por_aerolinea(ds)
 
     elif selection == "Análisis por Aeropuerto":
+        import folium
+        import plotly.express as px
         st.title("Análisis por Aeropuerto")
         st.header("Análisis por Aeropuerto")
         
-        aeropuerto_code = st.selectbox("Selecciona un Aeropuerto", aeropuertos['local'].unique())
+        registro = ds.registro
+        aeropuerto_code = st.selectbox("Selecciona un Aeropuerto", ds.aeropuertos['local'].unique())
         
         if aeropuerto_code:
-            aeropuerto_details = get_aeropuerto_details(aeropuertos, aeropuerto_code)
-            aeropuerto_name = aeropuerto_details['denominacion']
+            aeropuerto_details = get_aeropuerto_details(registro, aeropuerto_code)
+            aeropuerto_name = get_aeropuerto_name(registro, aeropuerto_code)
             st.subheader(f"Aeropuerto: {aeropuerto_name} ({aeropuerto_code})")
             
-            total_vuelos = len(filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code])
-            total_pasajeros = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code]['PAX'].sum()
-            aerolineas_operando = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code]['Aerolinea_Nombre'].nunique()
+            cubo_aeropuerto = filtrar_cubo(ds.cubo, desde='2019-01-01', aeropuertos=[aeropuerto_code])
+            indicadores = kpis(cubo_aeropuerto)
+            total_vuelos = indicadores['total_vuelos']
+            total_pasajeros = indicadores['total_pasajeros']
+            aerolineas_operando = cubo_aeropuerto['Aerolinea_Nombre'].nunique()
             
             st.metric("Total de Vuelos", total_vuelos)
             st.metric("Total de Pasajeros", total_pasajeros)
             st.metric("Aerolíneas Operando", aerolineas_operando)
             
-            vuelos_por_mes = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code].groupby(filtered_data['Fecha_UTC'].dt.to_period("M")).size().reset_index(name='Vuelos')
-            vuelos_por_mes['Fecha_UTC'] = vuelos_por_mes['Fecha_UTC'].dt.to_timestamp()
+            vuelos_por_mes = serie_mensual(cubo_aeropuerto)
             
-            fig_line = px.line(vuelos_por_mes, x='Fecha_UTC', y='Vuelos', title='Vuelos por Mes')
-            st.plotly_chart(fig_line)
+            mostrar_figura('aeropuerto_vuelos_mes', lambda: px.line(vuelos_por_mes, x='Mes', y='Vuelos', title='Vuelos por Mes'))
             
-            aerolineas_operando_df = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code].groupby('Aerolinea_Nombre').size().reset_index(name='Vuelos')
-            fig_bar = px.bar(aerolineas_operando_df, x='Aerolinea_Nombre', y='Vuelos', title='Aerolíneas Operando')
-            st.plotly_chart(fig_bar)
+            aerolineas_operando_df = por_dimension(cubo_aeropuerto, 'Aerolinea_Nombre')
+            mostrar_figura('aeropuerto_aerolineas', lambda: px.bar(aerolineas_operando_df, x='Aerolinea_Nombre', y='Vuelos', title='Aerolíneas Operando'))
             
-            m = folium.Map(location=[aeropuerto_details['longitud'], aeropuerto_details['latitud']], zoom_start=10)
-            folium.Marker(
-                location=[aeropuerto_details['longitud'], aeropuerto_details['latitud']],
-                popup=aeropuerto_name,
-                tooltip=aeropuerto_name
-            ).add_to(m)
-            
-            rutas_principales = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code]['Origen/Destino'].value_counts().head(10).index
-            for ruta in rutas_principales:
-                destino_details = get_aeropuerto_details(aeropuertos, ruta)
+            rutas_principales = ds.matriz_od.rutas(aeropuerto=aeropuerto_code, desde='2019-01-01', top=10)['Origen/Destino']
+            destinos, sin_ubicacion = registro.coordenadas(rutas_principales)
+
+            if aeropuerto_details is not None and pd.notna(aeropuerto_details['lat']):
+                m = folium.Map(location=[aeropuerto_details['lat'], aeropuerto_details['lon']], zoom_start=10)
                 folium.Marker(
-                    location=[destino_details['longitud'], destino_details['latitud']],
-                    popup=destino_details['denominacion'],
-                    tooltip=destino_details['denominacion']
+                    location=[aeropuerto_details['lat'], aeropuerto_details['lon']],
+                    popup=aeropuerto_name,
+                    tooltip=aeropuerto_name
                 ).add_to(m)
+            else:
+                m = folium.Map(location=[-34.61315, -58.37723], zoom_start=5)
+
+            for lat, lon, denominacion in zip(destinos['lat'], destinos['lon'], destinos['denominacion']):
+                folium.Marker(location=[lat, lon], popup=denominacion, tooltip=denominacion).add_to(m)
+            if sin_ubicacion:
+                st.warning(f"Destinos sin ubicación conocida: {', '.join(map(str, sin_ubicacion))}")
                 
-            folium_static(m)
+            mostrar_mapa(m)
             
             # Tabla detallada de vuelos
-            vuelos_detallados = filtered_data[filtered_data['Aeropuerto'] == aeropuerto_code]
-            st.dataframe(vuelos_detallados)
+            tabla_paginada("aeropuerto", ds.motor, ds.motor.filas(desde='2019-01-01', Aeropuerto=aeropuerto_code))
+
+    elif selection == "Análisis de Rutas":
+        import plotly.express as px
+        st.title("🛫 Análisis de Rutas")
+        motor = ds.motor
+        registro = ds.registro
+
+        aeropuerto = st.selectbox("Aeropuerto", ['Toda la red'] + motor.opciones('Aeropuerto'))
+        aerolineas = st.multiselect("Aerolíneas", motor.opciones('Aerolinea_Nombre'))
+        anio = st.selectbox("Año", ['Todos'] + list(ds.informes))
+        top = st.slider("Cantidad de rutas", min_value=5, max_value=100, value=20, step=5)
+
+        rutas = ds.matriz_od.rutas(
+            aeropuerto=None if aeropuerto == 'Toda la red' else aeropuerto,
+            aerolineas=aerolineas,
+            desde=None if anio == 'Todos' else f"{anio}-01-01",
+            hasta=None if anio == 'Todos' else f"{anio}-12-31",
+            top=top,
+        )
+
+        if rutas.empty:
+            st.warning("No hay rutas para los filtros seleccionados.")
+        else:
+            centro = None
+            if aeropuerto != 'Toda la red':
+                detalles = registro.buscar(aeropuerto)
+                if detalles is not None and pd.notna(detalles['lat']):
+                    centro = [detalles['lat'], detalles['lon']]
+            m, sin_ubicacion = mapa_rutas(registro, rutas, centro)
+            mostrar_mapa(m)
+            if sin_ubicacion:
+                st.warning(f"Aeropuertos sin ubicación conocida: {', '.join(map(str, sin_ubicacion))}")
+
+            mostrar_figura('rutas', lambda: px.bar(rutas.assign(Ruta=rutas['Aeropuerto'] + ' – ' + rutas['Origen/Destino']), x='Ruta', y='Vuelos', hover_data=['PAX'], title="Rutas con más vuelos"))
+            st.dataframe(rutas)
 
     elif selection == "Análisis de Pasajeros":
+        import plotly.express as px
         st.title("📊 Análisis de Pasajeros")
         
         # KPIs
-        total_pasajeros = filtered_data['PAX'].sum()
-        promedio_pasajeros_vuelo = filtered_data['PAX'].mean()
+        motor = ds.motor
+        cubo_pasajeros = filtrar_cubo(ds.cubo, desde='2019-01-01')
+        indicadores = kpis(cubo_pasajeros)
+        total_pasajeros = indicadores['total_pasajeros']
+        promedio_pasajeros_vuelo = indicadores['promedio_pasajeros']
         
         st.metric("Total de Pasajeros ✈", f"{total_pasajeros:,}")
         st.metric("Promedio de Pasajeros por Vuelo 🛫", f"{promedio_pasajeros_vuelo:.2f}")
 
-        fig_line = px.line(pasajeros_por_mes, x='Fecha_UTC', y='PAX', title="Número de Pasajeros por Mes 📅")
-        st.plotly_chart(fig_line)
+        pasajeros_por_mes = serie_mensual(cubo_pasajeros, 'PAX')
+        mostrar_figura('pasajeros_mes', lambda: px.line(pasajeros_por_mes, x='Mes', y='PAX', title="Número de Pasajeros por Mes 📅"))
+
+        pasajeros_por_aerolinea = por_dimension(cubo_pasajeros, 'Aerolinea_Nombre', 'PAX')
+        mostrar_figura('pasajeros_aerolinea', lambda: px.bar(pasajeros_por_aerolinea, x='Aerolinea_Nombre', y='PAX', title="Número de Pasajeros por Aerolínea 🛩"))
+
+        columnas_detalle = ['Fecha_UTC', 'Hora_UTC', 'Aerolinea_Nombre', 'Aeronave', 'PAX']
+        filas = motor.filas(desde='2019-01-01')
+        opciones_aerolineas = motor.opciones('Aerolinea_Nombre', pd.Timestamp('2019-01-01'))
+        balde = elegir_balde(*motor.rango_fechas(filas), series=len(opciones_aerolineas))
 
-        fig_bar_aerolinea = px.bar(pasajeros_por_aerolinea, x='Aerolinea_Nombre', y='PAX', title="Número de Pasajeros por Aerolínea 🛩")
-        st.plotly_chart(fig_bar_aerolinea)
+        def figura_pasajeros_vuelo():
+            datos_vuelo = motor.vista(filas, ['Fecha_UTC', 'Aerolinea_Nombre', 'PAX'])
+            pasajeros_por_vuelo = serie_por_balde(datos_vuelo, 'Fecha_UTC', 'PAX', balde, grupo='Aerolinea_Nombre')
+            return px.bar(pasajeros_por_vuelo, x='Fecha_UTC', y='PAX', title=f"Promedio de Pasajeros por Vuelo 🚀 (por {NOMBRES_BALDE[balde]})", color='Aerolinea_Nombre')
 
-        pasajeros_por_vuelo = filtered_data.groupby(['Fecha_UTC', 'Aerolinea_Nombre'])['PAX'].mean().reset_index()
-        fig_bar_vuelo = px.bar(pasajeros_por_vuelo, x='Fecha_UTC', y='PAX', title="Promedio de Pasajeros por Vuelo 🚀", color='Aerolinea_Nombre')
-        st.plotly_chart(fig_bar_vuelo)
+        mostrar_grafico(ds, 'pasajeros_por_vuelo', ('2019-01-01', balde), figura_pasajeros_vuelo)
 
         st.subheader("Detalles de Pasajeros por Vuelo 📋")
-        st.dataframe(filtered_data[['Fecha_UTC', 'Hora_UTC', 'Aerolinea_Nombre', 'Aeronave', 'PAX']])
+        tabla_paginada("pasajeros", motor, filas, columnas_detalle)
 
         st.sidebar.header("Filtros")
-        aerolineas = st.sidebar.multiselect("Selecciona Aerolíneas", options=filtered_data['Aerolinea_Nombre'].unique(), default=filtered_data['Aerolinea_Nombre'].unique())
-        fechas = st.sidebar.date_input("Selecciona un rango de fechas", [filtered_data['Fecha_UTC'].min(), filtered_data['Fecha_UTC'].max()])
-
-        filtered_data = filtered_data[(filtered_data['Aerolinea_Nombre'].isin(aerolineas)) & (filtered_data['Fecha_UTC'].between(*fechas))]
+        fecha_min, fecha_max = motor.rango_fechas()
+        fecha_min = max(fecha_min, pd.Timestamp('2019-01-01'))
+        aerolineas = st.sidebar.multiselect("Selecciona Aerolíneas", options=opciones_aerolineas, default=opciones_aerolineas)
+        fechas = st.sidebar.date_input("Selecciona un rango de fechas", [fecha_min.date(), fecha_max.date()])
+
+        # Con todas las aerolíneas elegidas no hace falta filtrar por aerolínea;
+        # sin ninguna, no hay filas.
+        filas = motor.filas(
+            desde=max(pd.Timestamp(fechas[0]), pd.Timestamp('2019-01-01')),
+            hasta=pd.Timestamp(fechas[-1]) + pd.Timedelta(days=1),
+            Aerolinea_Nombre=None if len(aerolineas) == len(opciones_aerolineas) else aerolineas,
+        )
+        if not aerolineas:
+            filas = filas[:0]
         
         st.subheader("Datos Filtrados ✨")
-        st.dataframe(filtered_data[['Fecha_UTC', 'Hora_UTC', 'Aerolinea_Nombre', 'Aeronave', 'PAX']])
+        tabla_paginada("pasajeros_filtrados", motor, filas, columnas_detalle)
 
 
     elif selection == "Mapas Interactivos":
         st.title("🗺Mapas de Aeropuertos")
         
-        datos = cargar_datos()
-        aeropuertos = datos['aeropuertos']
-        
-        m = folium.Map(location=[-34.61315, -58.37723], zoom_start=5, tiles='cartodb positron')
-        
-        marker_cluster = MarkerCluster().add_to(m)
-        
-        for idx, row in aeropuertos.iterrows():
-            if not pd.isna(row['longitud']) and not pd.isna(row['latitud']):
-                popup_text = f"""
-                <strong>{row['denominacion']} ({row['iata']})</strong><br>
-                OACI: {row['oaci'] if pd.notna(row['oaci']) else '-'}<br>
-                Tipo: {row['tipo'] if pd.notna(row['tipo']) else '-'}<br>
-                Elevación: {row['elev']} {row['uom_elev'] if pd.notna(row['uom_elev']) else 'Metros'}<br>
-                Provincia: {row['provincia'] if pd.notna(row['provincia']) else '-'}<br>
-                Uso: {row['uso'] if pd.notna(row['uso']) else '-'}
-                """
-                folium.Marker(
-                    location=[row['longitud'], row['latitud']],
-                    popup=popup_text,
-                    tooltip=row['denominacion'],
-                    icon=folium.Icon(color='blue', icon='info-sign')
-                ).add_to(marker_cluster)
-        
-        folium_static(m)
+        components.html(ds.mapa_aeropuertos, height=510)
 
     elif selection == "Acerca de":
         st.title("Realizado por:")
         st.write("-NICOL HINOJOSA YUCRA")
         st.write("-GISELA LEVITO")
 
-if __name__ == "_main_":
+if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,200 @@
+import argparse
+import datetime
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from datos import BASE_PATH, cargar_vuelos, descubrir_informes, directorio_cache, leer_csv_cacheado, leer_informe  # noqa: E402
+from agregados import MatrizOD, celdas_od, construir_cubo, filtrar_cubo, kpis  # noqa: E402
+from filtros import MotorFiltros  # noqa: E402
+from aeropuertos import RegistroAeropuertos  # noqa: E402
+from generar_informes import generar  # noqa: E402
+from instrumentacion import rss_mb  # noqa: E402
+
+# Mide cada etapa del dashboard sobre informes sintéticos de distintos
+# tamaños y agrega los resultados a resultados.jsonl para detectar
+# regresiones entre versiones:
+#
+#     python benchmarks/bench.py --filas 10000 1000000 --comparar
+#
+# Los datos generados quedan en benchmarks/datos/<filas>/ y se reutilizan.
+# Con --comparar cada etapa se compara con la corrida anterior del mismo
+# tamaño y el proceso termina con error si alguna empeoró más del umbral.
+
+DIRECTORIO_DATOS = os.path.join(RAIZ, 'benchmarks', 'datos')
+RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados.jsonl')
+CONSULTAS_FILTRO = 50
+UMBRAL_REGRESION = 0.25
+# Por debajo de este tiempo las diferencias son ruido.
+MINIMO_COMPARABLE = 0.05
+
+
+class Medicion:
+    # Tiempo y pico de memoria residente de un bloque; la memoria se mide
+    # desde un hilo que la lee cada pocos milisegundos.
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+
+    def _muestrear(self):
+        while not self._fin.wait(self.intervalo):
+            self.pico = max(self.pico, rss_mb())
+
+    def __enter__(self):
+        self.inicio_mb = self.pico = rss_mb()
+        self._fin = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+        self._hilo.start()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.segundos = time.perf_counter() - self._t0
+        self._fin.set()
+        self._hilo.join()
+        self.pico = max(self.pico, rss_mb())
+        return False
+
+
+def _consultas_general(motor, cubo, rng):
+    # Filtros como los de la pestaña General: rango de fechas, aeropuerto,
+    # aerolínea y tipo de movimiento, más los KPIs del cubo filtrado.
+    fecha_min, fecha_max = motor.rango_fechas()
+    aeropuertos = motor.opciones('Aeropuerto')
+    aerolineas = motor.opciones('Aerolinea_Nombre')
+    total = 0
+    for _ in range(CONSULTAS_FILTRO):
+        desde = fecha_min + (fecha_max - fecha_min) * rng.random() * 0.8
+        hasta = desde + pd.Timedelta(days=int(rng.integers(7, 120)))
+        aeropuerto = aeropuertos[rng.integers(len(aeropuertos))] if rng.random() < 0.7 else None
+        aerolinea = aerolineas[rng.integers(len(aerolineas))] if rng.random() < 0.5 else None
+        filas = motor.filas(desde, hasta, Aeropuerto=aeropuerto, Aerolinea_Nombre=aerolinea)
+        motor.vista(filas[:50])
+        kpis(filtrar_cubo(cubo, desde, hasta, [aeropuerto] if aeropuerto else None,
+                          [aerolinea] if aerolinea else None))
+        total += len(filas)
+    return {'consultas': CONSULTAS_FILTRO, 'filas_promedio': total / CONSULTAS_FILTRO}
+
+
+def correr(directorio, filas):
+    # Corre todas las etapas con los informes de `directorio` (que tiene un
+    # data/ adentro, como el dashboard) y devuelve un resultado por etapa.
+    anterior = os.getcwd()
+    os.chdir(directorio)
+    try:
+        resultados = []
+
+        def etapa(nombre, funcion):
+            with Medicion() as m:
+                detalle = funcion()
+            resultados.append({'etapa': nombre, 'segundos': round(m.segundos, 4),
+                               'pico_mb': round(m.pico, 1), 'delta_mb': round(m.pico - m.inicio_mb, 1),
+                               'detalle': detalle if isinstance(detalle, dict) else {}})
+            print(f"  {nombre:<16} {m.segundos:9.3f} s  pico {m.pico:8.1f} MB (+{m.pico - m.inicio_mb:.1f})", file=sys.stderr)
+
+        informes = descubrir_informes()
+        shutil.rmtree(directorio_cache(BASE_PATH), ignore_errors=True)
+        carga = {}
+        etapa('carga_fria', lambda: carga.update(zip(('vuelos', 'rangos', 'errores', 'norm'), cargar_vuelos(informes))))
+        etapa('carga_cache', lambda: carga.update(zip(('vuelos', 'rangos', 'errores', 'norm'), cargar_vuelos(informes))))
+        vuelos = carga['vuelos']
+        mayor = max(informes, key=lambda anio: os.path.getsize(informes[anio]))
+        etapa('normalizacion', lambda: {'filas': len(leer_informe(informes[mayor], mayor)[0])})
+
+        obj = {}
+        etapa('cubo', lambda: obj.update(cubo=construir_cubo(vuelos)))
+        etapa('matriz_od', lambda: obj.update(matriz=MatrizOD(celdas_od(vuelos))))
+        etapa('indices', lambda: obj.update(motor=MotorFiltros(vuelos)))
+        motor = obj['motor']
+        etapa('filtros', lambda: _consultas_general(motor, obj['cubo'], np.random.default_rng(0)))
+        todas = np.arange(len(vuelos))
+        etapa('pagina', lambda: {'filas': len(motor.pagina(todas, 0, 50))})
+        etapa('pagina_orden', lambda: {'filas': len(motor.pagina(todas, 0, 50, orden='PAX', descendente=True))})
+        etapa('pagina_ultima', lambda: {'filas': len(motor.pagina(todas, max(len(todas) - 50, 0), 50, orden='PAX'))})
+
+        # El mapa está en app.py; se importa recién acá para no cargar
+        # Streamlit y folium en las demás etapas.
+        from app import mapa_aeropuertos_html
+        registro = RegistroAeropuertos(leer_csv_cacheado(os.path.join('data', 'aeropuertos_detalle.csv')))
+        etapa('mapa', lambda: {'bytes': len(mapa_aeropuertos_html(registro))})
+        return resultados
+    finally:
+        os.chdir(anterior)
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def leer_resultados(ruta=RESULTADOS):
+    if not os.path.exists(ruta):
+        return []
+    with open(ruta, encoding='utf-8') as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def comparar(anteriores, nuevos, umbral=UMBRAL_REGRESION):
+    # Compara cada etapa con la última corrida previa del mismo tamaño.
+    # Devuelve las regresiones como (filas, etapa, antes, ahora).
+    regresiones = []
+    for nuevo in nuevos:
+        previos = [r for r in anteriores if r['filas'] == nuevo['filas'] and r['etapa'] == nuevo['etapa']]
+        if not previos:
+            continue
+        antes, ahora = previos[-1]['segundos'], nuevo['segundos']
+        if ahora > MINIMO_COMPARABLE and ahora > antes * (1 + umbral):
+            regresiones.append((nuevo['filas'], nuevo['etapa'], antes, ahora))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks del dashboard sobre informes sintéticos.")
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="tamaños a medir, en movimientos totales (por defecto %(default)s)")
+    parser.add_argument('--resultados', default=RESULTADOS, help="archivo jsonl donde se agregan los resultados")
+    parser.add_argument('--comparar', action='store_true', help="fallar si alguna etapa empeoró respecto de la corrida anterior")
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION, help="empeoramiento tolerado (por defecto %(default)s)")
+    parser.add_argument('--no-guardar', action='store_true', help="no agregar los resultados al archivo")
+    args = parser.parse_args(argv)
+
+    anteriores = leer_resultados(args.resultados)
+    corrida = {'fecha': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': _commit(),
+               'python': sys.version.split()[0], 'pandas': pd.__version__}
+    nuevos = []
+    for filas in args.filas:
+        directorio = os.path.join(DIRECTORIO_DATOS, str(filas))
+        if not os.path.isdir(os.path.join(directorio, 'data')):
+            print(f"Generando {filas:,} filas en {directorio}", file=sys.stderr)
+            generar(directorio, filas)
+        print(f"{filas:,} filas", file=sys.stderr)
+        nuevos += [{**corrida, 'filas': filas, **resultado} for resultado in correr(directorio, filas)]
+
+    if not args.no_guardar:
+        with open(args.resultados, 'a', encoding='utf-8') as f:
+            for resultado in nuevos:
+                f.write(json.dumps(resultado, ensure_ascii=False) + '\n')
+
+    if args.comparar:
+        regresiones = comparar(anteriores, nuevos, args.umbral)
+        for filas, nombre, antes, ahora in regresiones:
+            print(f"REGRESIÓN {filas:,} filas, {nombre}: {antes:.3f} s -> {ahora:.3f} s", file=sys.stderr)
+        if regresiones:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
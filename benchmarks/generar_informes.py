@@ -0,0 +1,148 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Genera informes anuales sintéticos con el formato de los del ministerio
+# (mismas columnas, separador ';', fechas dd/mm/aaaa y los encabezados que
+# cambian de un año a otro) para medir el dashboard a distintas escalas:
+#
+#     python benchmarks/generar_informes.py --filas 1000000 --salida benchmarks/datos/1000000
+#
+# Los archivos quedan en <salida>/data/, como los espera el dashboard si se
+# lo corre desde <salida>.
+# Los aeropuertos son los reales de aeropuertos_detalle.csv, con más tráfico
+# en los que tienen código IATA; los pasajeros dependen de la aeronave. Se
+# escribe por bloques, así que la memoria no depende de la cantidad de filas.
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AEROPUERTOS = os.path.join(RAIZ, 'data', 'aeropuertos_detalle.csv')
+BLOQUE = 1_000_000
+
+# Nombre de archivo y encabezados de cada año, como en los informes reales.
+ARCHIVOS = {
+    2019: '2019_informe_ministerio.csv',
+    2020: '2020_informe_ministerio.csv',
+    2021: '202112_informe_ministerio.csv',
+    2022: '202212-informe-ministerio.csv',
+    2023: '202312-informe-ministerio.csv',
+    2024: '202405-informe-ministerio.csv',
+}
+ENCABEZADOS = {
+    'fecha': {2019: 'Fecha', 2020: 'Fecha'},
+    'origen': {2019: 'Origen / Destino', 2020: 'Origen / Destino'},
+    'aerolinea': {2022: 'Aerolínea Nombre'},
+    'pax': {2021: 'PAX', 2022: 'PAX', 2023: 'PAX'},
+}
+# Meses que cubre cada informe (el de 2024 es el acumulado hasta mayo).
+MESES = {2024: 5}
+# Peso relativo de cada año: 2020 y 2021 tuvieron mucho menos tráfico.
+PESOS_ANIO = {2019: 1.0, 2020: 0.35, 2021: 0.5, 2022: 0.85, 2023: 1.0, 2024: 0.42}
+
+AEROLINEAS = [
+    ('AEROLINEAS ARGENTINAS SA', 0.45), ('FB LÍNEAS AÉREAS - FLYBONDI', 0.15),
+    ('JETSMART AIRLINES S.A.', 0.13), ('LADE', 0.02), ('AMERICAN JET', 0.03),
+    ('ANDES LÍNEAS AÉREAS', 0.03), ('LATAM AIRLINES GROUP', 0.04), ('0', 0.15),
+]
+# (aeronave, asientos, peso)
+AERONAVES = [
+    ('BO-B737-800', 186, 0.25), ('BO-B737-8MAX', 186, 0.15), ('AIB-A320-200', 174, 0.15),
+    ('EMB-ERJ190100IGW', 96, 0.15), ('AIB-A330-200', 272, 0.03), ('PIPER-PA-28', 3, 0.12),
+    ('CESSNA-172', 3, 0.10), ('0', 0, 0.05),
+]
+CLASES = ['Regular', 'No Regular']
+CLASIFICACIONES = ['Doméstico', 'Internacional']
+MOVIMIENTOS = ['Aterrizaje', 'Despegue']
+# Perfil horario (UTC) aproximado de los movimientos.
+PERFIL_HORARIO = np.array([2, 2, 3, 3, 2, 2, 1, 1, 1, 2, 4, 6, 7, 7, 7, 7, 7, 7, 6, 6, 5, 5, 4, 3], dtype=float)
+
+
+def _pesos(valores):
+    pesos = np.asarray(valores, dtype=float)
+    return pesos / pesos.sum()
+
+
+def aeropuertos_con_peso(ruta=AEROPUERTOS):
+    # Códigos locales con un peso tipo Zipf: los aeropuertos con IATA (los
+    # comerciales) concentran el tráfico, el resto aparece poco.
+    aeropuertos = pd.read_csv(ruta, sep=';', encoding='utf-8-sig', dtype=str)
+    aeropuertos = aeropuertos[aeropuertos['local'].notna()]
+    comerciales = aeropuertos['iata'].notna().to_numpy()
+    rango = np.arange(1, len(aeropuertos) + 1)
+    pesos = np.where(comerciales, 50.0, 1.0) / rango ** 0.5
+    return aeropuertos['local'].to_numpy(), _pesos(pesos)
+
+
+def generar_bloque(rng, anio, filas, codigos, pesos_codigos):
+    meses = MESES.get(anio, 12)
+    inicio = pd.Timestamp(f'{anio}-01-01')
+    dias = (inicio + pd.DateOffset(months=meses) - inicio).days
+    fechas = inicio + pd.to_timedelta(rng.integers(0, dias, filas), unit='D')
+    horas = rng.choice(24, filas, p=_pesos(PERFIL_HORARIO))
+    minutos = rng.integers(0, 60, filas)
+
+    nombres, pesos = zip(*AEROLINEAS)
+    aeronave = rng.choice(len(AERONAVES), filas, p=_pesos([a[2] for a in AERONAVES]))
+    asientos = np.array([a[1] for a in AERONAVES])[aeronave]
+    pasajeros = np.floor(asientos * rng.beta(6, 2, filas)).astype(np.int64)
+
+    return pd.DataFrame({
+        ENCABEZADOS['fecha'].get(anio, 'Fecha UTC'): fechas.strftime('%d/%m/%Y'),
+        'Hora UTC': pd.Series(horas).astype(str) + ':' + pd.Series(minutos).map('{:02d}'.format),
+        'Clase de Vuelo (todos los vuelos)': rng.choice(CLASES, filas, p=[0.7, 0.3]),
+        'Clasificación Vuelo': rng.choice(CLASIFICACIONES, filas, p=[0.85, 0.15]),
+        'Tipo de Movimiento': rng.choice(MOVIMIENTOS, filas),
+        'Aeropuerto': rng.choice(codigos, filas, p=pesos_codigos),
+        ENCABEZADOS['origen'].get(anio, 'Origen/Destino'): rng.choice(codigos, filas, p=pesos_codigos),
+        ENCABEZADOS['aerolinea'].get(anio, 'Aerolinea Nombre'): rng.choice(nombres, filas, p=_pesos(pesos)),
+        'Aeronave': np.array([a[0] for a in AERONAVES])[aeronave],
+        ENCABEZADOS['pax'].get(anio, 'Pasajeros'): pasajeros,
+        'Calidad dato': 'DEFINITIVO',
+    })
+
+
+def filas_por_anio(filas, anios):
+    pesos = _pesos([PESOS_ANIO.get(anio, 1.0) for anio in anios])
+    cantidades = np.floor(pesos * filas).astype(np.int64)
+    cantidades[-1] += filas - cantidades.sum()
+    return dict(zip(anios, cantidades.tolist()))
+
+
+def generar(salida, filas, anios=tuple(ARCHIVOS), semilla=0, bloque=BLOQUE):
+    # Escribe un informe por año (más aeropuertos_detalle.csv) con `filas`
+    # movimientos en total en <salida>/data/. Devuelve {año: ruta}.
+    salida = os.path.join(salida, 'data')
+    os.makedirs(salida, exist_ok=True)
+    rng = np.random.default_rng(semilla)
+    codigos, pesos_codigos = aeropuertos_con_peso()
+    rutas = {}
+    for anio, cantidad in filas_por_anio(filas, list(anios)).items():
+        ruta = os.path.join(salida, ARCHIVOS.get(anio, f'{anio}_informe_ministerio.csv'))
+        with open(ruta, 'w', encoding='utf-8', newline='') as f:
+            # Al menos un bloque, para que un año sin filas tenga encabezado.
+            for inicio in range(0, max(cantidad, 1), bloque):
+                parte = generar_bloque(rng, anio, min(bloque, cantidad - inicio), codigos, pesos_codigos)
+                parte.to_csv(f, sep=';', index=False, header=inicio == 0)
+        rutas[anio] = ruta
+    destino = os.path.join(salida, os.path.basename(AEROPUERTOS))
+    if not os.path.exists(destino):
+        with open(AEROPUERTOS, 'rb') as origen, open(destino, 'wb') as copia:
+            copia.write(origen.read())
+    return rutas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera informes del ministerio sintéticos.")
+    parser.add_argument('--filas', type=int, default=100_000, help="movimientos en total, entre todos los años (por defecto %(default)s)")
+    parser.add_argument('--salida', required=True, help="directorio donde escribir los informes")
+    parser.add_argument('--anios', type=int, nargs='+', default=list(ARCHIVOS), help="años a generar")
+    parser.add_argument('--semilla', type=int, default=0)
+    args = parser.parse_args(argv)
+    for anio, ruta in generar(args.salida, args.filas, args.anios, args.semilla).items():
+        print(f"{anio}: {ruta}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Presupuesto de memoria de la caché del proceso, en MB. Se puede cambiar
+# con la variable de entorno CACHE_MB sin tocar el código.
+PRESUPUESTO_CACHE_MB = int(os.environ.get('CACHE_MB', 2048))
+
+
+def _arreglos(arreglo):
+    # Los arreglos de numpy detrás de una columna; None si no se sabe.
+    if isinstance(arreglo, np.ndarray):
+        return [arreglo]
+    if isinstance(arreglo, pd.Categorical):
+        return [arreglo.codes] + (_arreglos(arreglo.categories.array) or [])
+    if hasattr(arreglo, '_data') and hasattr(arreglo, '_mask'):
+        return [arreglo._data, arreglo._mask]
+    if isinstance(getattr(arreglo, '_ndarray', None), np.ndarray):
+        return [arreglo._ndarray]
+    return None
+
+
+def _buffer(arreglo):
+    # (clave, dueño, bytes) de la memoria que referencia un arreglo: las
+    # vistas (iloc, columnas de otra tabla) llegan hasta el mismo dueño y se
+    # cuentan una sola vez, con el tamaño completo que mantienen vivo.
+    while isinstance(arreglo.base, np.ndarray):
+        arreglo = arreglo.base
+    duenio = arreglo if arreglo.base is None else arreglo.base
+    return id(duenio), duenio, arreglo.nbytes
+
+
+def medir(valor, buffers=None, _vistos=None):
+    # Bytes de un valor de la caché: devuelve los sueltos (textos, columnas
+    # de tipos desconocidos) y llena `buffers` ({clave: (dueño, bytes)}) con
+    # la memoria de arreglos y tablas, sin repetir la compartida.
+    buffers = {} if buffers is None else buffers
+    # Guarda los objetos y no solo sus id: las vistas temporales (p. ej.
+    # Categorical.codes) se liberan y su id se puede repetir.
+    vistos = {} if _vistos is None else _vistos
+    if id(valor) in vistos:
+        return 0
+    vistos[id(valor)] = valor
+    if isinstance(valor, np.ndarray):
+        clave, duenio, bytes_buffer = _buffer(valor)
+        buffers[clave] = (duenio, bytes_buffer)
+        return 0
+    if isinstance(valor, pd.Index):
+        return int(valor.memory_usage())
+    if isinstance(valor, pd.Series):
+        valor = valor.to_frame()
+    if isinstance(valor, pd.DataFrame):
+        sueltos = int(valor.index.memory_usage())
+        for _, columna in valor.items():
+            arreglos = _arreglos(columna.array)
+            if arreglos is None:
+                sueltos += int(columna.memory_usage(index=False))
+            else:
+                sueltos += sum(medir(arreglo, buffers, vistos) for arreglo in arreglos)
+        return sueltos
+    if isinstance(valor, (str, bytes)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sum(medir(k, buffers, vistos) + medir(v, buffers, vistos) for k, v in valor.items())
+    if isinstance(valor, (list, tuple, set)):
+        return sum(medir(v, buffers, vistos) for v in valor)
+    if hasattr(valor, '__dict__'):
+        return sum(medir(v, buffers, vistos) for v in vars(valor).values())
+    return 0
+
+
+def tamanio(valor):
+    # Estimación en bytes de lo que ocupa un valor por sí solo.
+    buffers = {}
+    sueltos = medir(valor, buffers)
+    return sueltos + sum(bytes_buffer for _, bytes_buffer in buffers.values())
+
+
+class CacheCompartida:
+    # Caché del proceso compartida por todas las sesiones: cada valor se
+    # calcula una vez y las sesiones reciben el mismo objeto, sin copias, así
+    # que se tratan como de solo lectura. Las claves incluyen la versión de
+    # los datos. Al pasar el presupuesto se descartan las entradas usadas
+    # hace más tiempo (LRU).
+    #
+    # La memoria de arreglos y tablas se cuenta por buffer y no por entrada:
+    # un buffer que comparten varias entradas (los vuelos dentro de la carga
+    # y del motor de filtros) se cobra una vez y se libera recién cuando se
+    # descarta la última entrada que lo usa.
+
+    def __init__(self, presupuesto_mb=PRESUPUESTO_CACHE_MB):
+        self.presupuesto = presupuesto_mb * 1024 * 1024
+        # clave -> (valor, bytes sueltos, claves de sus buffers)
+        self._entradas = OrderedDict()
+        # clave del buffer -> [entradas que lo usan, dueño, bytes]
+        self._buffers = {}
+        self._ocupado = 0
+        self._lock = threading.Lock()
+        # Uno por clave en cálculo, para que dos sesiones no calculen lo mismo.
+        self._calculando = {}
+        self.aciertos = 0
+        self.fallos = 0
+        self.descartes = 0
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    @property
+    def ocupado(self):
+        return self._ocupado
+
+    def obtener(self, clave, funcion):
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return self._entradas[clave][0]
+            lock_clave = self._calculando.setdefault(clave, threading.Lock())
+
+        with lock_clave:
+            with self._lock:
+                # Otra sesión pudo haberlo calculado mientras esperábamos.
+                if clave in self._entradas:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return self._entradas[clave][0]
+                self.fallos += 1
+            # El lock de la clave se suelta recién con el valor guardado: si
+            # no, quien llegara en el medio no vería ni la entrada ni el lock
+            # y lo calcularía de nuevo.
+            try:
+                valor = funcion()
+                self.guardar(clave, valor)
+            finally:
+                with self._lock:
+                    self._calculando.pop(clave, None)
+            return valor
+
+    def guardar(self, clave, valor):
+        buffers = {}
+        sueltos = medir(valor, buffers)
+        with self._lock:
+            if clave in self._entradas:
+                self._quitar(clave)
+            for clave_buffer, (duenio, bytes_buffer) in buffers.items():
+                uso = self._buffers.get(clave_buffer)
+                if uso is None:
+                    self._buffers[clave_buffer] = [1, duenio, bytes_buffer]
+                    self._ocupado += bytes_buffer
+                else:
+                    uso[0] += 1
+            self._entradas[clave] = (valor, sueltos, tuple(buffers))
+            self._ocupado += sueltos
+            self._ajustar()
+
+    def _quitar(self, clave):
+        _, sueltos, buffers = self._entradas.pop(clave)
+        self._ocupado -= sueltos
+        for clave_buffer in buffers:
+            uso = self._buffers[clave_buffer]
+            uso[0] -= 1
+            if uso[0] == 0:
+                del self._buffers[clave_buffer]
+                self._ocupado -= uso[2]
+
+    def _ajustar(self):
+        # La última entrada se conserva aunque sola pase el presupuesto: la
+        # acaba de pedir una sesión.
+        while self._ocupado > self.presupuesto and len(self._entradas) > 1:
+            self._quitar(next(iter(self._entradas)))
+            self.descartes += 1
+
+    def invalidar(self, conservar=None):
+        # Descarta todo salvo las claves para las que `conservar(clave)` es
+        # verdadero; sirve para tirar versiones viejas de los datos.
+        with self._lock:
+            for clave in list(self._entradas):
+                if conservar is None or not conservar(clave):
+                    self._quitar(clave)
+
+    def estadisticas(self):
+        with self._lock:
+            consultas = self.aciertos + self.fallos
+            return {
+                'entradas': len(self._entradas),
+                'ocupado_mb': self.ocupado / 1024 / 1024,
+                'presupuesto_mb': self.presupuesto / 1024 / 1024,
+                'aciertos': self.aciertos,
+                'fallos': self.fallos,
+                'descartes': self.descartes,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+            }
+
+
+# Una sola instancia por proceso: el módulo se importa una vez y sobrevive a
+# las re-ejecuciones del script de Streamlit.
+CACHE = CacheCompartida()
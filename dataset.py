@@ -0,0 +1,215 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from datos import BASE_PATH, cargar_vuelos, descubrir_informes, errores_guardados, leer_csv_cacheado, podar_cache, resumir_informes, separar_anios, version_datos
+from agregados import MatrizOD, celdas_od, combinar_cubos, construir_cubo
+from filtros import MotorFiltros
+from aeropuertos import RegistroAeropuertos
+from cache_compartida import CACHE
+from instrumentacion import etapa
+
+ARCHIVO_AEROPUERTOS = 'aeropuertos_detalle.csv'
+TABLAS_PRECARGA = ('cubo', 'motor', 'matriz_od', 'registro')
+
+
+class derivado:
+    # Declara una tabla derivada de un Dataset. Se calcula la primera vez que
+    # se pide y queda memorizada junto con la versión de los datos.
+
+    def __init__(self, funcion):
+        self.funcion = funcion
+        self.nombre = funcion.__name__
+
+    def __set_name__(self, owner, nombre):
+        self.nombre = nombre
+        self.clase = owner.__name__
+
+    def __get__(self, dataset, owner=None):
+        if dataset is None:
+            return self
+        return dataset._obtener(self.nombre, self.funcion, self.clase)
+
+
+class Dataset:
+    # Base para conjuntos de tablas derivadas perezosas. `memoria` es un dict
+    # que sobrevive entre ejecuciones (por ejemplo, uno guardado en
+    # st.session_state); se vacía cuando cambia la versión de los datos.
+    #
+    # Con una `cache` compartida los valores viven en ella, con clave
+    # (clase, nombre, versión), y no en la memoria de la sesión: una sesión
+    # nueva reutiliza lo que ya calculó otra.
+
+    def __init__(self, version, memoria, cache=None):
+        self.version = version
+        if memoria.get('version') != version:
+            memoria.clear()
+            memoria['version'] = version
+        self._memoria = memoria
+        self._cache = cache
+        if cache is not None:
+            # Lo calculado con otra versión de los datos ya no lo va a pedir
+            # nadie; se libera en vez de esperar a que lo descarte el LRU.
+            clases = {clase.__name__ for clase in type(self).__mro__}
+            cache.invalidar(lambda clave: not isinstance(clave, tuple) or clave[0] not in clases
+                           or clave[2] == version)
+
+    def _clave(self, nombre, parametros=(), clase=None):
+        return (clase or type(self).__name__, nombre, self.version) + tuple(parametros)
+
+    def _calcular(self, nombre, funcion):
+        # Solo se mide lo que se calcula; los aciertos de caché no son etapas.
+        with etapa(nombre) as medicion:
+            valor = funcion()
+            medicion.filas = getattr(valor, 'shape', (None,))[0]
+        return valor
+
+    def _obtener(self, nombre, funcion, clase=None):
+        # La clave lleva la clase que declara el derivado y no la del objeto:
+        # lo que calcula un DatosVuelos (la API, la precarga) lo reutilizan
+        # sus subclases.
+        if self._cache is not None:
+            return self._cache.obtener(self._clave(nombre, clase=clase), lambda: self._calcular(nombre, lambda: funcion(self)))
+        if nombre not in self._memoria:
+            self._memoria[nombre] = self._calcular(nombre, lambda: funcion(self))
+        return self._memoria[nombre]
+
+    def consulta(self, nombre, parametros, funcion):
+        # Resultado de una consulta con parámetros (hashables), memorizado
+        # con la versión de los datos. Sin caché compartida se calcula.
+        if self._cache is None:
+            return funcion()
+        return self._cache.obtener(self._clave(nombre, parametros), funcion)
+
+    def calculado(self, nombre):
+        # Con caché compartida cuenta lo que está en ella: lo pudo calcular
+        # otra sesión o haberlo descartado el LRU.
+        if self._cache is not None:
+            return self._clave(nombre, clase=getattr(type(self), nombre).clase) in self._cache
+        return nombre in self._memoria
+
+
+def rutas_archivos(directorio=BASE_PATH):
+    # Los informes se descubren en el directorio de datos en cada ejecución:
+    # un informe nuevo o reemplazado cambia la versión de los datos.
+    return {'aeropuertos': os.path.join(directorio, ARCHIVO_AEROPUERTOS), **descubrir_informes(directorio)}
+
+
+def cargar_aeropuertos(ruta):
+    try:
+        return leer_csv_cacheado(ruta), None
+    except Exception as e:
+        return pd.DataFrame(columns=['local', 'oaci', 'iata', 'denominacion', 'latitud', 'longitud']), str(e)
+
+
+def cargar_datos(rutas):
+    # Carga los informes anuales ({año: ruta}); devuelve la tabla combinada,
+    # la normalización, los errores y las filas de cada año. Las vistas por
+    # año no se guardan: se arman al pedirlas, sin copiar los datos.
+    vuelos, rangos, errores, normalizaciones = cargar_vuelos(rutas)
+    return vuelos, normalizaciones, errores, rangos
+
+
+class DatosVuelos(Dataset):
+    # Los vuelos y todo lo que se deriva de ellos, declarado una vez para el
+    # dashboard y la API. Cada tabla se calcula recién cuando se la pide y
+    # queda en la caché del proceso hasta que cambian los archivos, así que
+    # lo que no se usa no se carga y las sesiones nuevas usan lo que ya cargó
+    # otra.
+
+    def __init__(self, memoria, directorio=BASE_PATH, cache=CACHE):
+        self.rutas = rutas_archivos(directorio)
+        super().__init__(version_datos(self.rutas.values()), memoria, cache=cache)
+
+    @derivado
+    def carga_aeropuertos(self):
+        return cargar_aeropuertos(self.rutas['aeropuertos'])
+
+    @derivado
+    def carga(self):
+        podar_cache(self.rutas.values())
+        return cargar_datos(self.informes)
+
+    @derivado
+    def resumen_informes(self):
+        # Filas y normalización por año sin cargar los vuelos, para las
+        # vistas que solo muestran eso.
+        return resumir_informes(self.informes)
+
+    @property
+    def informes(self):
+        return {key: ruta for key, ruta in self.rutas.items() if key != 'aeropuertos'}
+
+    @property
+    def aeropuertos(self):
+        return self.carga_aeropuertos[0]
+
+    @property
+    def datos(self):
+        vuelos = self.vuelos
+        por_anio = separar_anios(vuelos, self.carga[3])
+        return {key: por_anio.get(key, vuelos.iloc[0:0]) for key in self.informes}
+
+    @property
+    def vuelos(self):
+        return self.carga[0]
+
+    @property
+    def normalizaciones(self):
+        return self.carga[1]
+
+    def filas_anio(self, year, filas=None):
+        # Posiciones en la tabla combinada de las filas de un año, o de las
+        # `filas` (crecientes) que caen en ese año.
+        inicio, fin = self.carga[3].get(year, (0, 0))
+        if filas is None:
+            return np.arange(inicio, fin)
+        return filas[np.searchsorted(filas, inicio):np.searchsorted(filas, fin)]
+
+    def errores(self):
+        # Solo los de lo que ya se cargó, para no forzar la carga; si no se
+        # leyó ningún informe, los que quedaron anotados en la cache.
+        errores = {}
+        if self.calculado('carga_aeropuertos') and self.carga_aeropuertos[1]:
+            errores['aeropuertos'] = self.carga_aeropuertos[1]
+        if self.calculado('resumen_informes'):
+            errores.update(self.resumen_informes[2])
+        if self.calculado('carga'):
+            errores.update(self.carga[2])
+        if not (self.calculado('resumen_informes') or self.calculado('carga')):
+            errores.update(errores_guardados(self.informes))
+        return errores
+
+    def por_particion(self, nombre, construir):
+        # Un resultado por informe, guardado con la firma de ese archivo y no
+        # con la versión de todos: cuando llega un informe nuevo o cambiado
+        # solo se recalculan sus meses y el resto sale de la caché.
+        partes = []
+        for key, (inicio, fin) in self.carga[3].items():
+            clave = (nombre, key, version_datos([self.rutas[key]]))
+            parte = lambda: construir(self.vuelos.iloc[inicio:fin])
+            partes.append(parte() if self._cache is None else self._cache.obtener(clave, parte))
+        return partes or [construir(self.vuelos)]
+
+    @derivado
+    def cubo(self):
+        return combinar_cubos(self.por_particion('cubo_particion', construir_cubo))
+
+    @derivado
+    def motor(self):
+        return MotorFiltros(self.vuelos)
+
+    @derivado
+    def matriz_od(self):
+        return MatrizOD(pd.concat(self.por_particion('celdas_od', celdas_od), ignore_index=True))
+
+    @derivado
+    def registro(self):
+        return RegistroAeropuertos(self.aeropuertos)
+
+    def precargar(self):
+        # Calcula de antemano las tablas que usan casi todas las vistas.
+        for nombre in TABLAS_PRECARGA:
+            getattr(self, nombre)
+        return self
@@ -0,0 +1,571 @@
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+from instrumentacion import etapa
+
+BASE_PATH = 'data/'
+
+# Se incrementa cuando cambia la forma en que se convierte un CSV, para que
+# las caches viejas se regeneren aunque el CSV no haya cambiado.
+VERSION_CACHE = 3
+
+# Informes del ministerio en el directorio de datos: AAAA_informe_ministerio.csv
+# (año completo) o AAAAMM-informe-ministerio.csv (acumulado del año hasta ese
+# mes). Cada año es una partición y vale su informe más reciente.
+PATRON_INFORME = re.compile(r'^(\d{4})(\d{2})?[_-]informe[_-]ministerio\.csv$', re.IGNORECASE)
+
+# Filas por bloque al parsear un CSV: acota la memoria de la conversión
+# independientemente del tamaño del informe.
+CHUNK_FILAS = 250_000
+
+
+# Tabla de vuelos canónica: todos los informes se llevan a estas columnas.
+COLUMNAS_CANONICAS = [
+    'Fecha_UTC', 'Hora_UTC', 'Clase_de_Vuelo', 'Clasificacion_Vuelo',
+    'Tipo_de_Movimiento', 'Aeropuerto', 'Origen/Destino', 'Aerolinea_Nombre',
+    'Aeronave', 'PAX', 'Calidad_dato',
+]
+# Sin estas columnas un informe no se puede usar.
+COLUMNAS_OBLIGATORIAS = ['Fecha_UTC', 'Aeropuerto', 'Tipo_de_Movimiento']
+
+# Nombres con que aparecen las columnas canónicas en los distintos informes
+# del ministerio (después de reemplazar los espacios por '_').
+ALIAS_COLUMNAS = {
+    'Fecha': 'Fecha_UTC',
+    'Hora': 'Hora_UTC',
+    'Clase_de_Vuelo_(todos_los_vuelos)': 'Clase_de_Vuelo',
+    'Clasificación_Vuelo': 'Clasificacion_Vuelo',
+    'Origen_/_Destino': 'Origen/Destino',
+    'Aerolínea_Nombre': 'Aerolinea_Nombre',
+    'Pasajeros': 'PAX',
+    'Calidad_del_dato': 'Calidad_dato',
+}
+# Alias que solo valen para un año, con prioridad sobre ALIAS_COLUMNAS:
+# {'2019': {'Fecha_Local': 'Fecha_UTC'}}.
+MAPEO_POR_ANIO = {}
+
+# Esquema compacto de la tabla canónica. Las columnas de texto con pocos
+# valores distintos se leen como categóricas con un diccionario común a todos
+# los años, los conteos como enteros chicos y la fecha junto con la hora en
+# una única columna datetime64.
+COLUMNAS_CATEGORICAS = [
+    'Hora_UTC', 'Clase_de_Vuelo', 'Clasificacion_Vuelo', 'Tipo_de_Movimiento',
+    'Aeropuerto', 'Origen/Destino', 'Aerolinea_Nombre', 'Aeronave', 'Calidad_dato',
+]
+COLUMNAS_ENTERAS = {'PAX': 'UInt16'}
+COLUMNA_FECHA = 'Fecha_UTC'
+COLUMNA_HORA = 'Hora_UTC'
+
+
+def _limpiar_columnas(columnas):
+    return [col.strip().replace(' ', '_') for col in columnas]
+
+
+def _parsear_fecha(fecha, hora):
+    texto = fecha.astype(str) + ' ' + hora.fillna('0:00').astype(str)
+    resultado = pd.to_datetime(texto, format='%d/%m/%Y %H:%M', errors='coerce')
+
+    # Filas con otro formato (por ejemplo, con segundos): se infiere por fila.
+    fallidos = resultado.isna() & fecha.notna()
+    if fallidos.any():
+        resultado[fallidos] = pd.to_datetime(texto[fallidos], dayfirst=True, errors='coerce')
+    return resultado
+
+
+def mapeo_columnas(columnas, anio=None):
+    # Decide qué columna del informe corresponde a cada columna canónica.
+    # Devuelve {'mapeadas': {original: canónica}, 'descartadas': [...],
+    # 'faltantes': [...]}; las columnas que ya tienen el nombre canónico no
+    # figuran en 'mapeadas'.
+    alias = {**ALIAS_COLUMNAS, **MAPEO_POR_ANIO.get(anio, {})}
+    mapeo = {col: col for col in columnas if col in COLUMNAS_CANONICAS}
+    for col in columnas:
+        canonica = alias.get(col)
+        if col not in mapeo and canonica and canonica not in mapeo.values():
+            mapeo[col] = canonica
+
+    faltantes = [col for col in COLUMNAS_CANONICAS if col not in mapeo.values()]
+    obligatorias = [col for col in COLUMNAS_OBLIGATORIAS if col in faltantes]
+    if obligatorias:
+        raise ValueError(f"Faltan columnas obligatorias: {', '.join(obligatorias)}")
+    return {
+        'mapeadas': {col: canonica for col, canonica in mapeo.items() if col != canonica},
+        'descartadas': [col for col in columnas if col not in mapeo],
+        'faltantes': faltantes,
+    }
+
+
+def normalizar_columnas(df, normalizacion):
+    df = df.drop(columns=normalizacion['descartadas']).rename(columns=normalizacion['mapeadas'])
+    for col in normalizacion['faltantes']:
+        df[col] = pd.NA
+    return df[COLUMNAS_CANONICAS]
+
+
+def aplicar_esquema(df):
+    df[COLUMNA_FECHA] = _parsear_fecha(df[COLUMNA_FECHA], df[COLUMNA_HORA])
+
+    for col, dtype in COLUMNAS_ENTERAS.items():
+        valores = pd.to_numeric(df[col], errors='coerce')
+        # Un conteo negativo o fuera de rango no es un dato válido.
+        limite = np.iinfo(pd.api.types.pandas_dtype(dtype).numpy_dtype).max
+        valores = valores.where((valores >= 0) & (valores <= limite))
+        df[col] = valores.round().astype(dtype)
+
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype('string')
+    return df
+
+
+def preparar_informe(df, normalizacion):
+    return aplicar_esquema(normalizar_columnas(df, normalizacion))
+
+
+def leer_encabezado(full_path):
+    return _limpiar_columnas(pd.read_csv(full_path, delimiter=';', nrows=0).columns)
+
+
+def leer_csv(full_path):
+    df = pd.read_csv(full_path, delimiter=';', dayfirst=True)
+    df.columns = _limpiar_columnas(df.columns)
+    return df
+
+
+def leer_csv_por_bloques(full_path, chunksize=CHUNK_FILAS):
+    for chunk in pd.read_csv(full_path, delimiter=';', dayfirst=True, chunksize=chunksize):
+        chunk.columns = _limpiar_columnas(chunk.columns)
+        yield chunk
+
+
+def leer_informe(full_path, anio=None):
+    df = leer_csv(full_path)
+    normalizacion = mapeo_columnas(list(df.columns), anio)
+    return preparar_informe(df, normalizacion), normalizacion
+
+
+def _a_categoricas(df):
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype('category')
+    return df
+
+
+def vuelos_vacios():
+    # La tabla canónica sin filas, con los mismos tipos que una cargada, para
+    # que los índices y agregados funcionen igual sin informes.
+    tipos = {COLUMNA_FECHA: 'datetime64[ns]', **COLUMNAS_ENTERAS,
+             **{col: 'category' for col in COLUMNAS_CATEGORICAS}}
+    return pd.DataFrame({col: pd.Series(dtype=tipos[col]) for col in COLUMNAS_CANONICAS})
+
+
+def _leer_parquet(ruta):
+    # Las columnas categóricas se leen directamente como diccionarios.
+    return pq.read_table(ruta, read_dictionary=COLUMNAS_CATEGORICAS)
+
+
+def firma_archivo(full_path):
+    info = os.stat(full_path)
+    return {'mtime_ns': info.st_mtime_ns, 'size': info.st_size}
+
+
+def hash_archivo(full_path, bloque=1 << 20):
+    sha1 = hashlib.sha1()
+    with open(full_path, 'rb') as f:
+        for parte in iter(lambda: f.read(bloque), b''):
+            sha1.update(parte)
+    return sha1.hexdigest()
+
+
+def version_datos(rutas):
+    # Identifica el contenido cargado: cambia si cambia cualquier archivo o la
+    # forma en que se convierten. Sirve de clave para las caches derivadas.
+    sha1 = hashlib.sha1(str(VERSION_CACHE).encode())
+    for ruta in sorted(rutas):
+        if os.path.exists(ruta):
+            firma = firma_archivo(ruta)
+            sha1.update(f"{ruta}:{firma['mtime_ns']}:{firma['size']};".encode())
+    return sha1.hexdigest()[:16]
+
+
+def descubrir_informes(directorio=BASE_PATH):
+    # {año: ruta} con el informe más reciente de cada año. Solo lista el
+    # directorio: lo que cambió se detecta después por la firma de cada
+    # archivo, así que se puede llamar en cada ejecución.
+    elegidos = {}
+    if os.path.isdir(directorio):
+        for nombre in sorted(os.listdir(directorio)):
+            coincidencia = PATRON_INFORME.match(nombre)
+            if coincidencia is None:
+                continue
+            anio, mes = coincidencia.group(1), int(coincidencia.group(2) or 12)
+            if anio not in elegidos or mes >= elegidos[anio][0]:
+                elegidos[anio] = (mes, os.path.join(directorio, nombre))
+    return {anio: elegidos[anio][1] for anio in sorted(elegidos)}
+
+
+def directorio_cache(directorio):
+    # La cache de cada directorio de datos queda adentro de él, así que no
+    # depende del directorio de trabajo y dos directorios con archivos del
+    # mismo nombre no se pisan.
+    return os.path.join(directorio, '.cache')
+
+
+def podar_cache(vigentes):
+    # Borra de la cache las conversiones de archivos que ya no se usan (por
+    # ejemplo, el acumulado anterior de un año que recibió un informe nuevo).
+    # Solo se tocan las caches de los directorios de `vigentes`.
+    nombres_por_cache = {}
+    for ruta in vigentes:
+        cache = directorio_cache(os.path.dirname(os.path.abspath(ruta)))
+        nombres_por_cache.setdefault(cache, set()).add(os.path.splitext(os.path.basename(ruta))[0])
+    for cache, nombres in nombres_por_cache.items():
+        if not os.path.isdir(cache):
+            continue
+        for archivo in os.listdir(cache):
+            nombre, extension = os.path.splitext(archivo)
+            if extension in ('.parquet', '.json') and nombre not in nombres:
+                try:
+                    os.remove(os.path.join(cache, archivo))
+                except OSError:
+                    pass
+
+
+# Un lock por archivo de origen: la precarga y una sesión pueden pedir la
+# conversión del mismo informe a la vez; la segunda espera y encuentra la
+# cache ya escrita en lugar de convertirlo de nuevo.
+_locks_conversion = {}
+_lock_locks = threading.Lock()
+
+
+def _lock_conversion(full_path):
+    with _lock_locks:
+        return _locks_conversion.setdefault(os.path.abspath(full_path), threading.Lock())
+
+
+def _temporal(ruta):
+    # Nombre propio de cada escritor (otro proceso, como la API, puede estar
+    # escribiendo la misma cache): nunca se publica un archivo mezclado.
+    return f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _rutas_cache(full_path):
+    nombre = os.path.splitext(os.path.basename(full_path))[0]
+    base = os.path.join(directorio_cache(os.path.dirname(full_path)), nombre)
+    return base + '.parquet', base + '.json'
+
+
+def _leer_manifiesto(ruta_manifiesto):
+    try:
+        with open(ruta_manifiesto, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_manifiesto(ruta_manifiesto, manifiesto):
+    tmp = _temporal(ruta_manifiesto)
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifiesto, f)
+    os.replace(tmp, ruta_manifiesto)
+
+
+def cache_vigente(full_path):
+    ruta_parquet, ruta_manifiesto = _rutas_cache(full_path)
+    manifiesto = _leer_manifiesto(ruta_manifiesto)
+    if not manifiesto or manifiesto.get('version') != VERSION_CACHE or manifiesto.get('error'):
+        return False
+    if not os.path.exists(ruta_parquet):
+        return False
+
+    firma = firma_archivo(full_path)
+    if manifiesto.get('firma') == firma:
+        return True
+
+    # Cambió la fecha o el tamaño: solo se reconvierte si el contenido cambió
+    # (por ejemplo, un archivo copiado de nuevo conserva el mismo hash).
+    if manifiesto.get('sha1') == hash_archivo(full_path):
+        manifiesto['firma'] = firma
+        _escribir_manifiesto(ruta_manifiesto, manifiesto)
+        return True
+    return False
+
+
+def _escribir_por_bloques(full_path, destino, chunksize, normalizacion):
+    writer = None
+    try:
+        for chunk in leer_csv_por_bloques(full_path, chunksize):
+            if normalizacion is not None:
+                chunk = preparar_informe(chunk, normalizacion)
+            tabla = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(destino, tabla.schema)
+            else:
+                tabla = tabla.cast(writer.schema)
+            writer.write_table(tabla)
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer is not None
+
+
+def convertir_a_parquet(full_path, anio=None, es_informe=True, chunksize=CHUNK_FILAS):
+    # Convierte un CSV al formato columnar bloque a bloque; los informes de
+    # vuelos se normalizan a la tabla canónica en el camino. Devuelve False si
+    # no se pudo convertir; en ese caso no queda ninguna cache escrita.
+    ruta_parquet, ruta_manifiesto = _rutas_cache(full_path)
+    firma = firma_archivo(full_path)
+    tmp = _temporal(ruta_parquet)
+    os.makedirs(os.path.dirname(ruta_parquet), exist_ok=True)
+    try:
+        normalizacion = mapeo_columnas(leer_encabezado(full_path), anio) if es_informe else None
+        try:
+            escrito = _escribir_por_bloques(full_path, tmp, chunksize, normalizacion)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # Un bloque infirió otro tipo que el primero (por ejemplo, una
+            # columna vacía al principio): se convierte el archivo completo.
+            escrito = False
+        if not escrito:
+            df = leer_csv(full_path)
+            if normalizacion is not None:
+                df = preparar_informe(df, normalizacion)
+            df.to_parquet(tmp, index=False)
+        os.replace(tmp, ruta_parquet)
+        _escribir_manifiesto(ruta_manifiesto, {
+            'version': VERSION_CACHE,
+            'origen': os.path.basename(full_path),
+            'firma': firma,
+            'sha1': hash_archivo(full_path),
+            'normalizacion': normalizacion,
+        })
+        return True
+    except Exception:
+        # Columnas con tipos mezclados u otro problema de conversión: se usa
+        # el CSV directamente y se vuelve a intentar en la próxima carga.
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+
+def _anotar_error(full_path, error):
+    # El error de un informe que no se pudo leer queda en su manifiesto, para
+    # mostrarlo sin volver a leerlo (ver errores_guardados). La cache no
+    # queda vigente: la próxima carga lo intenta de nuevo.
+    _, ruta_manifiesto = _rutas_cache(full_path)
+    try:
+        with _lock_conversion(full_path):
+            os.makedirs(os.path.dirname(ruta_manifiesto), exist_ok=True)
+            _escribir_manifiesto(ruta_manifiesto, {
+                'version': VERSION_CACHE,
+                'origen': os.path.basename(full_path),
+                'firma': firma_archivo(full_path),
+                'error': error,
+            })
+    except OSError:
+        pass
+
+
+def errores_guardados(archivos):
+    # Errores de los informes ({año: ruta}) sin convertir ni leer nada: los
+    # archivos que faltan y los que la última carga no pudo leer, si no
+    # cambiaron desde entonces.
+    errores = {}
+    for anio, ruta in archivos.items():
+        if not os.path.exists(ruta):
+            errores[anio] = f"No se encontró el archivo {ruta}"
+            continue
+        manifiesto = _leer_manifiesto(_rutas_cache(ruta)[1])
+        if manifiesto and manifiesto.get('error') and manifiesto.get('firma') == firma_archivo(ruta):
+            errores[anio] = manifiesto['error']
+    return errores
+
+
+def leer_csv_cacheado(full_path):
+    # Sin pyarrow no hay formato columnar disponible: se lee el CSV como antes.
+    if pq is None:
+        return leer_csv(full_path)
+
+    with _lock_conversion(full_path):
+        convertido = cache_vigente(full_path) or convertir_a_parquet(full_path, es_informe=False)
+    if convertido:
+        return pd.read_parquet(_rutas_cache(full_path)[0])
+    return leer_csv(full_path)
+
+
+def contexto_procesos():
+    # Los procesos de trabajo no se crean con fork: el proceso que los pide
+    # (Streamlit, la API) tiene hilos corriendo, entre ellos los de Arrow, y
+    # un hijo de fork puede quedar trabado en un lock que tenía otro hilo.
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in metodos else 'spawn')
+
+
+def _convertir_pendientes(archivos, max_workers):
+    with contextlib.ExitStack() as locks:
+        # Siempre en el mismo orden, para que dos hilos con informes en común
+        # no se traben entre sí.
+        for ruta in sorted(set(map(os.path.abspath, archivos.values()))):
+            locks.enter_context(_lock_conversion(ruta))
+        pendientes = {anio: ruta for anio, ruta in archivos.items() if not cache_vigente(ruta)}
+        if len(pendientes) <= 1 or max_workers == 1:
+            return {anio: convertir_a_parquet(ruta, anio) for anio, ruta in pendientes.items()}
+
+        # Cada informe se parsea en su propio proceso; solo vuelve el
+        # resultado de la conversión, los datos quedan en la cache en disco.
+        workers = min(len(pendientes), max_workers or os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=contexto_procesos()) as pool:
+            futuros = {anio: pool.submit(convertir_a_parquet, ruta, anio)
+                       for anio, ruta in pendientes.items()}
+            return {anio: futuro.result() for anio, futuro in futuros.items()}
+
+
+def _tipos_enteros():
+    # Los enteros con nulos siguen siendo enteros nullable en lugar de pasar
+    # a float64 al convertir desde Arrow.
+    tipos = {}
+    for dtype in COLUMNAS_ENTERAS.values():
+        dtype = pd.api.types.pandas_dtype(dtype)
+        tipos[pa.from_numpy_dtype(dtype.numpy_dtype)] = dtype
+    return tipos
+
+
+def _concatenar_tablas(tablas):
+    try:
+        return pa.concat_tables(tablas, promote_options='permissive')
+    except TypeError:
+        # pyarrow < 14
+        return pa.concat_tables(tablas, promote=True)
+
+
+def _unificar_categoricas(partes):
+    # Mismo diccionario en todos los años; si no, pd.concat vuelve a object.
+    for col in COLUMNAS_CATEGORICAS:
+        categorias = union_categoricals(
+            [df[col].astype('category') for df in partes], ignore_order=True).categories
+        for df in partes:
+            df[col] = pd.Categorical(df[col], categories=categorias)
+    return partes
+
+
+def _rangos(tamanios):
+    rangos, inicio = {}, 0
+    for anio, filas in tamanios.items():
+        rangos[anio] = (inicio, inicio + filas)
+        inicio += filas
+    return rangos
+
+
+def _cargar_vuelos_sin_arrow(archivos):
+    partes, errores, normalizaciones = {}, {}, {}
+    for anio, ruta in archivos.items():
+        try:
+            partes[anio], normalizaciones[anio] = leer_informe(ruta, anio)
+        except Exception as e:
+            errores[anio] = str(e)
+    if not partes:
+        return vuelos_vacios(), {}, errores, normalizaciones
+    _unificar_categoricas(list(partes.values()))
+    vuelos = pd.concat(partes.values(), ignore_index=True)
+    rangos = _rangos({anio: len(df) for anio, df in partes.items()})
+    return vuelos, rangos, errores, normalizaciones
+
+
+def cargar_vuelos(archivos, max_workers=None):
+    # Carga los informes anuales ({año: ruta}) en una sola tabla canónica.
+    # Devuelve la tabla, el rango de filas de cada año ({año: (inicio, fin)}),
+    # los errores de carga y el informe de normalización de cada año.
+    if pq is None:
+        return _cargar_vuelos_sin_arrow(archivos)
+
+    errores = {}
+    existentes = {}
+    for anio, ruta in archivos.items():
+        if os.path.exists(ruta):
+            existentes[anio] = ruta
+        else:
+            errores[anio] = f"No se encontró el archivo {ruta}"
+    with etapa('convertir_informes'):
+        convertidos = _convertir_pendientes(existentes, max_workers)
+
+    tablas, tamanios, normalizaciones = [], {}, {}
+    with etapa('leer_particiones') as medicion:
+        for anio, ruta in existentes.items():
+            try:
+                if convertidos.get(anio, True):
+                    ruta_parquet, ruta_manifiesto = _rutas_cache(ruta)
+                    tabla = _leer_parquet(ruta_parquet)
+                    normalizaciones[anio] = _leer_manifiesto(ruta_manifiesto)['normalizacion']
+                else:
+                    # No se pudo escribir la cache: se lee el CSV directamente, y
+                    # si el informe no es válido el error llega hasta acá.
+                    df, normalizaciones[anio] = leer_informe(ruta, anio)
+                    tabla = pa.Table.from_pandas(_a_categoricas(df), preserve_index=False)
+            except Exception as e:
+                errores[anio] = str(e)
+                _anotar_error(ruta, errores[anio])
+                continue
+            tamanios[anio] = tabla.num_rows
+            tablas.append(tabla)
+        medicion.filas = sum(tamanios.values())
+
+    if not tablas:
+        return vuelos_vacios(), {}, errores, normalizaciones
+
+    # concat_tables no copia los buffers y self_destruct los libera a medida
+    # que se convierten: el pico de memoria queda cerca del tamaño final en
+    # lugar de tener cada año y la tabla combinada al mismo tiempo.
+    with etapa('concatenar', filas=sum(tamanios.values())):
+        combinada = _concatenar_tablas(tablas).unify_dictionaries()
+        del tablas
+        vuelos = combinada.to_pandas(self_destruct=True, split_blocks=True,
+                                     types_mapper=_tipos_enteros().get)
+        del combinada
+    return vuelos, _rangos(tamanios), errores, normalizaciones
+
+
+def resumir_informes(archivos, max_workers=None):
+    # Filas y normalización de cada informe sin cargar los vuelos: salen de
+    # los metadatos del Parquet y del manifiesto de la cache (los informes
+    # sin cache vigente se convierten antes). Devuelve las filas por año, las
+    # normalizaciones y los errores, como cargar_vuelos.
+    if pq is None:
+        _, rangos, errores, normalizaciones = cargar_vuelos(archivos)
+        return {anio: fin - inicio for anio, (inicio, fin) in rangos.items()}, normalizaciones, errores
+
+    errores = {anio: f"No se encontró el archivo {ruta}" for anio, ruta in archivos.items() if not os.path.exists(ruta)}
+    existentes = {anio: ruta for anio, ruta in archivos.items() if anio not in errores}
+    convertidos = _convertir_pendientes(existentes, max_workers)
+    filas, normalizaciones = {}, {}
+    for anio, ruta in existentes.items():
+        try:
+            if convertidos.get(anio, True):
+                ruta_parquet, ruta_manifiesto = _rutas_cache(ruta)
+                filas[anio] = pq.read_metadata(ruta_parquet).num_rows
+                normalizaciones[anio] = _leer_manifiesto(ruta_manifiesto)['normalizacion']
+            else:
+                df, normalizaciones[anio] = leer_informe(ruta, anio)
+                filas[anio] = len(df)
+        except Exception as e:
+            errores[anio] = str(e)
+            _anotar_error(ruta, errores[anio])
+    return filas, normalizaciones, errores
+
+
+def separar_anios(vuelos, rangos):
+    # Vistas por año sobre la tabla combinada, sin duplicar los datos.
+    return {anio: vuelos.iloc[inicio:fin] for anio, (inicio, fin) in rangos.items()}
@@ -0,0 +1,184 @@
+import numpy as np
+import pandas as pd
+
+COLUMNAS_INDEXADAS = ['Aeropuerto', 'Aerolinea_Nombre', 'Tipo_de_Movimiento']
+
+
+def _posiciones(posiciones, filas):
+    # Con menos de 2**31 filas las posiciones entran en int32: la mitad de
+    # memoria por índice.
+    return posiciones.astype(np.int32, copy=False) if filas < 2**31 else posiciones
+
+
+class MotorFiltros:
+    # Índices sobre la tabla de vuelos para responder filtros combinados sin
+    # recorrer todas las filas: las filas ordenadas por fecha (el rango de
+    # fechas se resuelve con búsqueda binaria) y, para cada columna indexada,
+    # las filas de cada valor agrupadas por código de categoría.
+    #
+    # Una consulta arranca por el predicado más selectivo y evalúa el resto
+    # solo sobre esas filas, así el costo depende del tamaño del resultado.
+
+    def __init__(self, vuelos, columnas=COLUMNAS_INDEXADAS):
+        self.vuelos = vuelos
+        # La columna de fechas se usa tal cual (pasarla a otra unidad sería
+        # una copia); los límites de los filtros se llevan a su unidad.
+        self._fechas = vuelos['Fecha_UTC'].to_numpy()
+        if self._fechas.dtype.kind != 'M':
+            self._fechas = self._fechas.astype('datetime64[ns]')
+        self._unidad = np.datetime_data(self._fechas.dtype)[0]
+        self._orden_fechas = _posiciones(np.argsort(self._fechas, kind='stable'), len(vuelos))
+        self._fechas_ordenadas = self._fechas[self._orden_fechas]
+        # Las fechas NaT quedan al final del orden y nunca entran en un rango.
+        self._fechas_validas = int((~np.isnat(self._fechas)).sum())
+
+        self._indices = {}
+        for col in columnas:
+            valores = pd.Categorical(vuelos[col])
+            codigos = valores.codes
+            # Orden estable: dentro de cada código las filas quedan crecientes.
+            orden = _posiciones(np.argsort(codigos, kind='stable'), len(vuelos))
+            limites = np.searchsorted(codigos[orden], np.arange(len(valores.categories) + 1))
+            self._indices[col] = (valores.categories, codigos, orden, limites)
+        self._opciones = {}
+        self._posiciones_orden = {}
+
+    def __len__(self):
+        return len(self.vuelos)
+
+    def rango_fechas(self, filas=None):
+        # Primera y última fecha de toda la tabla o de las filas indicadas.
+        if filas is not None:
+            fechas = self._fechas[filas]
+            fechas = fechas[~np.isnat(fechas)]
+            if not len(fechas):
+                return None, None
+            return pd.Timestamp(fechas.min()), pd.Timestamp(fechas.max())
+        if not self._fechas_validas:
+            return None, None
+        return (pd.Timestamp(self._fechas_ordenadas[0]),
+                pd.Timestamp(self._fechas_ordenadas[self._fechas_validas - 1]))
+
+    def opciones(self, col, desde=None, hasta=None):
+        # Valores presentes de una columna indexada, opcionalmente dentro de
+        # un rango de fechas. Se calculan una vez por combinación.
+        clave = (col, desde, hasta)
+        if clave not in self._opciones:
+            categorias, codigos, _, limites = self._indices[col]
+            if desde is None and hasta is None:
+                presentes = np.flatnonzero(np.diff(limites) > 0)
+            else:
+                presentes = np.unique(codigos[self._filas_en_rango(desde, hasta)])
+                presentes = presentes[presentes >= 0]
+            self._opciones[clave] = sorted(categorias[presentes].tolist())
+        return self._opciones[clave]
+
+    def _fecha(self, valor):
+        return np.datetime64(pd.Timestamp(valor), self._unidad)
+
+    def _rango_posiciones(self, desde, hasta):
+        validas = self._fechas_ordenadas[:self._fechas_validas]
+        inicio = 0 if desde is None else int(np.searchsorted(validas, self._fecha(desde)))
+        fin = len(validas) if hasta is None else int(np.searchsorted(validas, self._fecha(hasta)))
+        return inicio, max(inicio, fin)
+
+    def _filas_en_rango(self, desde, hasta):
+        inicio, fin = self._rango_posiciones(desde, hasta)
+        return np.sort(self._orden_fechas[inicio:fin])
+
+    def _codigos_seleccionados(self, col, seleccion):
+        categorias = self._indices[col][0]
+        codigos = categorias.get_indexer(pd.Index(list(seleccion)))
+        # Sin repetidos: un valor elegido dos veces no duplica sus filas.
+        return np.unique(codigos[codigos >= 0])
+
+    def _filas_con_valores(self, col, codigos):
+        _, _, orden, limites = self._indices[col]
+        partes = [orden[limites[c]:limites[c + 1]] for c in codigos]
+        if len(partes) == 1:
+            return partes[0]
+        return np.sort(np.concatenate(partes)) if partes else np.empty(0, dtype=np.intp)
+
+    def filas(self, desde=None, hasta=None, **valores):
+        # Posiciones (crecientes) de las filas con desde <= Fecha_UTC < hasta
+        # y, para cada columna indexada pasada por nombre, un valor dentro de
+        # la selección. Las selecciones vacías o None no filtran.
+        predicados = []
+        if desde is not None or hasta is not None:
+            inicio, fin = self._rango_posiciones(desde, hasta)
+            predicados.append((fin - inicio, 'fecha', (desde, hasta)))
+        for col, seleccion in valores.items():
+            if isinstance(seleccion, str):
+                seleccion = [seleccion]
+            if seleccion:
+                codigos = self._codigos_seleccionados(col, seleccion)
+                limites = self._indices[col][3]
+                tamanio = int((limites[codigos + 1] - limites[codigos]).sum())
+                predicados.append((tamanio, col, codigos))
+
+        if not predicados:
+            return np.arange(len(self.vuelos))
+
+        predicados.sort(key=lambda p: p[0])
+        _, col, argumento = predicados[0]
+        filas = self._filas_en_rango(*argumento) if col == 'fecha' else self._filas_con_valores(col, argumento)
+        for _, col, argumento in predicados[1:]:
+            if not len(filas):
+                break
+            if col == 'fecha':
+                fechas = self._fechas[filas]
+                desde, hasta = argumento
+                mascara = ~np.isnat(fechas)
+                if desde is not None:
+                    mascara &= fechas >= self._fecha(desde)
+                if hasta is not None:
+                    mascara &= fechas < self._fecha(hasta)
+            else:
+                mascara = np.isin(self._indices[col][1][filas], argumento)
+            filas = filas[mascara]
+        return filas
+
+    def vista(self, filas, columnas=None):
+        # Primero las filas y después las columnas, para no copiar columnas
+        # enteras de la tabla.
+        if columnas is None:
+            return self.vuelos.take(filas)
+        return self.vuelos.iloc[filas, self.vuelos.columns.get_indexer(columnas)]
+
+    def _posicion_orden(self, col):
+        # Lugar de cada fila en el orden estable de la columna, con los nulos
+        # al final, y cuántas no son nulas. Son valores únicos, así que una
+        # página ordenada sale igual en cada consulta. Una vez por columna.
+        if col not in self._posiciones_orden:
+            valores = self.vuelos[col]
+            if isinstance(valores.dtype, pd.CategoricalDtype):
+                # Las categorías no vienen ordenadas: se ordenan por valor.
+                categorias = valores.cat.categories
+                rango = np.empty(len(categorias) + 1, dtype=np.int64)
+                rango[categorias.argsort()] = np.arange(len(categorias))
+                rango[-1] = len(categorias)
+                claves = rango[valores.cat.codes.to_numpy()]
+            else:
+                claves, unicos = pd.factorize(valores, sort=True)
+                claves = np.where(claves < 0, len(unicos), claves)
+            orden = _posiciones(np.argsort(claves, kind='stable'), len(claves))
+            posicion = np.empty_like(orden)
+            posicion[orden] = np.arange(len(orden))
+            self._posiciones_orden[col] = (posicion, int(valores.notna().sum()))
+        return self._posiciones_orden[col]
+
+    def pagina(self, filas, inicio, cantidad, columnas=None, orden=None, descendente=False):
+        # Las filas [inicio, inicio + cantidad) de `filas`, opcionalmente
+        # ordenadas por una columna. Solo se ordenan las que llegan hasta el
+        # final de la página (selección parcial), no todo el resultado.
+        fin = min(inicio + cantidad, len(filas))
+        if orden is None or inicio >= fin:
+            return self.vista(filas[inicio:fin], columnas)
+        posicion, validas = self._posicion_orden(orden)
+        claves = posicion[filas]
+        if descendente:
+            # Se invierte solo el tramo no nulo: los nulos siguen al final.
+            claves = np.where(claves < validas, validas - 1 - claves, claves)
+        candidatos = np.argpartition(claves, fin - 1)[:fin] if fin < len(claves) else np.arange(len(claves))
+        candidatos = candidatos[np.argsort(claves[candidatos])]
+        return self.vista(filas[candidatos[inicio:fin]], columnas)
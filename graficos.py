@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+# Puntos máximos que manda un gráfico al navegador, sumando todas sus series.
+MAX_PUNTOS = 2000
+
+# Baldes de tiempo, del más fino al más grueso: (frecuencia de pandas,
+# duración aproximada, nombre para los títulos).
+BALDES = [
+    ('h', pd.Timedelta(hours=1), 'hora'),
+    ('D', pd.Timedelta(days=1), 'día'),
+    ('W', pd.Timedelta(weeks=1), 'semana'),
+    ('M', pd.Timedelta(days=30), 'mes'),
+]
+NOMBRES_BALDE = {frecuencia: nombre for frecuencia, _, nombre in BALDES}
+
+
+def elegir_balde(desde, hasta, series=1, max_puntos=MAX_PUNTOS):
+    # El balde más fino con el que `series` series sobre [desde, hasta]
+    # entran en max_puntos. Si ni por mes entran, queda el mes y el resto lo
+    # resuelve reducir().
+    if desde is None or hasta is None or pd.isna(desde) or pd.isna(hasta):
+        return BALDES[-1][0]
+    duracion = pd.Timestamp(hasta) - pd.Timestamp(desde)
+    for frecuencia, tamanio, _ in BALDES:
+        if (duracion // tamanio + 1) * max(series, 1) <= max_puntos:
+            return frecuencia
+    return BALDES[-1][0]
+
+
+def lttb(x, y, puntos):
+    # Largest-Triangle-Three-Buckets: posiciones de `puntos` puntos de la
+    # serie (x creciente) que conservan su forma. Siempre quedan el primero
+    # y el último; de cada tramo intermedio, el que forma el triángulo más
+    # grande con el elegido antes y el promedio del tramo siguiente.
+    largo = len(x)
+    if puntos >= largo:
+        return np.arange(largo)
+    if puntos < 3:
+        return np.array([0, largo - 1][:max(puntos, 0)], dtype=np.int64)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    limites = np.linspace(1, largo - 1, puntos - 1).astype(np.int64)
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, largo - 1
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        if i + 2 < len(limites):
+            siguiente = slice(limites[i + 1], limites[i + 2])
+            promedio_x, promedio_y = x[siguiente].mean(), y[siguiente].mean()
+        else:
+            promedio_x, promedio_y = x[-1], y[-1]
+        area = np.abs((x[anterior] - promedio_x) * (y[inicio:fin] - y[anterior])
+                      - (x[anterior] - x[inicio:fin]) * (promedio_y - y[anterior]))
+        anterior = inicio + int(np.argmax(area))
+        elegidos[i + 1] = anterior
+    return elegidos
+
+
+def reducir(serie, x, y, grupo=None, max_puntos=MAX_PUNTOS):
+    # Aplica LTTB a cada serie (una por valor de `grupo`) para que entre todas
+    # no pasen de max_puntos. Las que ya entran quedan como están.
+    if len(serie) <= max_puntos:
+        return serie
+    partes = [serie] if grupo is None else [parte for _, parte in serie.groupby(grupo, observed=True)]
+    puntos = max(max_puntos // len(partes), 3)
+    reducidas = []
+    for parte in partes:
+        parte = parte.sort_values(x)
+        tiempos = parte[x]
+        if pd.api.types.is_datetime64_any_dtype(tiempos):
+            tiempos = tiempos.astype('int64')
+        reducidas.append(parte.iloc[lttb(tiempos.to_numpy(), parte[y].to_numpy(dtype=np.float64, na_value=np.nan), puntos)])
+    return pd.concat(reducidas, ignore_index=True)
+
+
+def serie_por_balde(tabla, fecha, valor, balde, grupo=None, agregacion='mean', max_puntos=MAX_PUNTOS):
+    # Agrega `valor` por balde de tiempo (y por `grupo`); la columna de la
+    # fecha queda con el comienzo de cada balde.
+    inicio = tabla[fecha].dt.to_period(balde).dt.to_timestamp().rename(fecha)
+    claves = [inicio] if grupo is None else [inicio, tabla[grupo]]
+    serie = tabla.groupby(claves, observed=True)[valor].agg(agregacion).reset_index()
+    return reducir(serie, fecha, valor, grupo, max_puntos)
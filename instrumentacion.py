@@ -0,0 +1,257 @@
+import contextlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+# Mediciones de las etapas del dashboard: tiempo, filas y variación de la
+# memoria residente de cada bloque envuelto con etapa(). Las etapas de una
+# ejecución del script (una corrida) se guardan para el panel de depuración
+# y todas se suman en totales del proceso para exportarlos.
+#
+# Exportaciones opcionales, por variables de entorno:
+#   METRICAS_LOG         archivo al que se agrega una línea JSON por etapa.
+#   METRICAS_PROMETHEUS  archivo con los totales en formato de texto de
+#                        Prometheus, reescrito al terminar cada corrida.
+#   PERFILADOR_MS        muestrear la pila de cada corrida cada tantos ms y
+#                        guardar las que tarden más de PERFILADOR_UMBRAL
+#                        segundos (2 por defecto) en PERFILADOR_DIR.
+
+log = logging.getLogger(__name__)
+if os.environ.get('METRICAS_LOG'):
+    _handler = logging.FileHandler(os.environ['METRICAS_LOG'], encoding='utf-8')
+    _handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+RUTA_PROMETHEUS = os.environ.get('METRICAS_PROMETHEUS')
+PERFILADOR_MS = float(os.environ.get('PERFILADOR_MS', 0))
+PERFILADOR_UMBRAL = float(os.environ.get('PERFILADOR_UMBRAL', 2))
+PERFILADOR_DIR = os.environ.get('PERFILADOR_DIR', 'perfiles')
+
+_local = threading.local()
+_lock = threading.Lock()
+# etapa -> [ejecuciones, segundos, filas, máxima variación de memoria (MB)]
+_totales = {}
+_corridas = [0, 0.0]
+# nombre -> función sin argumentos que devuelve {métrica: valor}; se leen al
+# exportar, como medidores (p. ej. el estado de la caché).
+_medidores = {}
+
+
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return 0.0
+
+
+class Etapa:
+    __slots__ = ('nombre', 'filas', 'profundidad', 'inicio', 'segundos', 'delta_mb')
+
+    def __init__(self, nombre, filas=None, profundidad=0):
+        self.nombre = nombre
+        self.filas = filas
+        self.profundidad = profundidad
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+        self.delta_mb = 0.0
+
+    def como_dict(self):
+        return {'etapa': self.nombre, 'segundos': round(self.segundos, 6), 'filas': self.filas,
+                'delta_mb': round(self.delta_mb, 2), 'profundidad': self.profundidad}
+
+
+class Corrida:
+    # Las etapas de una ejecución del script, en orden de comienzo.
+
+    def __init__(self, nombre=None):
+        self.nombre = nombre
+        self.etapas = []
+        self.inicio = time.perf_counter()
+        self.segundos = 0.0
+        self.perfil = None
+
+    @property
+    def transcurrido(self):
+        return self.segundos or time.perf_counter() - self.inicio
+
+    def tabla(self):
+        # Una fila por etapa más 'otros' con el tiempo que no cae en ninguna.
+        import pandas as pd
+        etapas = sorted(self.etapas, key=lambda e: e.inicio)
+        filas = [{'Etapa': '· ' * e.profundidad + e.nombre, 'ms': e.segundos * 1000,
+                  'Filas': e.filas, 'Memoria (MB)': e.delta_mb} for e in etapas]
+        medido = sum(e.segundos for e in etapas if e.profundidad == 0)
+        filas.append({'Etapa': 'otros', 'ms': max(self.transcurrido - medido, 0) * 1000, 'Filas': None, 'Memoria (MB)': None})
+        return pd.DataFrame(filas).round({'ms': 1, 'Memoria (MB)': 1})
+
+
+def _pila():
+    if not hasattr(_local, 'pila'):
+        _local.pila = []
+    return _local.pila
+
+
+def corrida_actual():
+    return getattr(_local, 'corrida', None)
+
+
+@contextlib.contextmanager
+def etapa(nombre, filas=None):
+    # Mide el bloque. Las filas se pueden pasar o asignar adentro:
+    #     with etapa('cubo') as e:
+    #         cubo = construir_cubo(vuelos)
+    #         e.filas = len(cubo)
+    pila = _pila()
+    medicion = Etapa(nombre, filas, len(pila))
+    pila.append(medicion)
+    memoria = rss_mb()
+    try:
+        yield medicion
+    finally:
+        medicion.segundos = time.perf_counter() - medicion.inicio
+        medicion.delta_mb = rss_mb() - memoria
+        pila.pop()
+        _registrar(medicion)
+
+
+def _registrar(medicion):
+    corrida = corrida_actual()
+    if corrida is not None:
+        corrida.etapas.append(medicion)
+    with _lock:
+        total = _totales.setdefault(medicion.nombre, [0, 0.0, 0, 0.0])
+        total[0] += 1
+        total[1] += medicion.segundos
+        total[2] += medicion.filas or 0
+        total[3] = max(total[3], medicion.delta_mb)
+    if log.isEnabledFor(logging.INFO):
+        log.info(json.dumps({'ts': time.time(), 'corrida': corrida.nombre if corrida else None,
+                             **medicion.como_dict()}, ensure_ascii=False, default=str))
+
+
+class Perfilador:
+    # Perfilador por muestreo: desde otro hilo toma la pila del hilo medido
+    # cada `intervalo` segundos y cuenta cuántas veces aparece cada una. El
+    # resultado se guarda en formato "folded" (flamegraph.pl, speedscope).
+
+    def __init__(self, intervalo, hilo=None):
+        self.intervalo = intervalo
+        self.hilo = hilo if hilo is not None else threading.get_ident()
+        self.muestras = Counter()
+        self._fin = threading.Event()
+        self._muestreador = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while not self._fin.wait(self.intervalo):
+            frame = sys._current_frames().get(self.hilo)
+            pila = []
+            while frame is not None:
+                codigo = frame.f_code
+                pila.append(f"{os.path.basename(codigo.co_filename)}:{codigo.co_name}")
+                frame = frame.f_back
+            if pila:
+                self.muestras[';'.join(reversed(pila))] += 1
+
+    def iniciar(self):
+        self._muestreador.start()
+        return self
+
+    def detener(self):
+        self._fin.set()
+        self._muestreador.join()
+        return self.muestras
+
+    def guardar(self, ruta):
+        os.makedirs(os.path.dirname(ruta) or '.', exist_ok=True)
+        with open(ruta, 'w', encoding='utf-8') as f:
+            for pila, cantidad in self.muestras.most_common():
+                f.write(f"{pila} {cantidad}\n")
+        return ruta
+
+
+@contextlib.contextmanager
+def corrida(nombre=None, perfilar_ms=None):
+    # Agrupa las etapas de una ejecución del script. Con `perfilar_ms` (o
+    # PERFILADOR_MS) la corrida se perfila y, si tarda más que el umbral, el
+    # perfil se guarda en PERFILADOR_DIR y queda en `corrida.perfil`.
+    actual = Corrida(nombre)
+    _local.corrida = actual
+    intervalo = perfilar_ms or PERFILADOR_MS
+    perfilador = Perfilador(intervalo / 1000).iniciar() if intervalo else None
+    try:
+        yield actual
+    finally:
+        actual.segundos = time.perf_counter() - actual.inicio
+        _local.corrida = None
+        with _lock:
+            _corridas[0] += 1
+            _corridas[1] += actual.segundos
+        if perfilador is not None:
+            perfilador.detener()
+            if actual.segundos >= PERFILADOR_UMBRAL:
+                nombre_archivo = f"{time.strftime('%Y%m%d-%H%M%S')}-{_nombre_archivo(actual.nombre)}.folded"
+                actual.perfil = perfilador.guardar(os.path.join(PERFILADOR_DIR, nombre_archivo))
+        if RUTA_PROMETHEUS:
+            exportar_prometheus(RUTA_PROMETHEUS)
+
+
+def registrar_medidores(nombre, funcion):
+    # Registrar dos veces con el mismo nombre reemplaza al anterior, así que
+    # se puede llamar en cada ejecución del script.
+    _medidores[nombre] = funcion
+
+
+def _nombre_archivo(texto):
+    return ''.join(c if c.isalnum() else '_' for c in str(texto or 'corrida'))
+
+
+def _etiqueta(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def texto_prometheus(extra=None):
+    # Totales del proceso en el formato de texto de Prometheus, más los
+    # medidores registrados y los de `extra` ({nombre: valor}).
+    extra = dict(extra or {})
+    for funcion in list(_medidores.values()):
+        extra.update(funcion())
+    with _lock:
+        totales = {nombre: list(valores) for nombre, valores in _totales.items()}
+        corridas, segundos_corridas = _corridas
+    lineas = [
+        '# HELP pf_corridas_total Ejecuciones del script medidas.',
+        '# TYPE pf_corridas_total counter',
+        f'pf_corridas_total {corridas}',
+        '# HELP pf_corridas_segundos_total Tiempo total de las ejecuciones.',
+        '# TYPE pf_corridas_segundos_total counter',
+        f'pf_corridas_segundos_total {segundos_corridas:.6f}',
+    ]
+    metricas = [
+        ('pf_etapa_ejecuciones_total', 'counter', 'Veces que se ejecutó cada etapa.', 0, '{}'),
+        ('pf_etapa_segundos_total', 'counter', 'Tiempo acumulado de cada etapa.', 1, '{:.6f}'),
+        ('pf_etapa_filas_total', 'counter', 'Filas procesadas por cada etapa.', 2, '{}'),
+        ('pf_etapa_memoria_max_mb', 'gauge', 'Mayor aumento de memoria residente de cada etapa.', 3, '{:.2f}'),
+    ]
+    for nombre, tipo, ayuda, indice, formato in metricas:
+        lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} {tipo}']
+        lineas += [f'{nombre}{{etapa="{_etiqueta(etapa)}"}} {formato.format(valores[indice])}'
+                   for etapa, valores in sorted(totales.items())]
+    for nombre, valor in extra.items():
+        lineas += [f'# TYPE {nombre} gauge', f'{nombre} {valor}']
+    return '\n'.join(lineas) + '\n'
+
+
+def exportar_prometheus(ruta, extra=None):
+    # Se escribe a un temporal y se renombra, para que quien lo lea (p. ej.
+    # el textfile collector de node_exporter) nunca vea un archivo a medias.
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        f.write(texto_prometheus(extra))
+    os.replace(temporal, ruta)
@@ -0,0 +1,45 @@
+import importlib
+import logging
+import threading
+
+from datos import BASE_PATH
+from dataset import DatosVuelos
+from instrumentacion import etapa
+
+# Precarga en segundo plano: carga los informes y arma las tablas derivadas
+# en la caché compartida del proceso, y después importa las bibliotecas de
+# mapas y gráficos, para que la primera sesión no pague ni una cosa ni la
+# otra. Corre una sola vez por proceso; si una sesión pide una tabla que se
+# está calculando, espera a esa cuenta en lugar de repetirla.
+
+log = logging.getLogger(__name__)
+
+# Se importan recién cuando una pestaña las usa; acá se adelantan.
+MODULOS_DIFERIDOS = ['plotly.express', 'folium', 'folium.plugins', 'streamlit_folium']
+
+_hilo = None
+_lock = threading.Lock()
+
+
+def precargar(directorio=BASE_PATH):
+    try:
+        with etapa('precarga'):
+            DatosVuelos({}, directorio).precargar()
+    except Exception:
+        # La sesión que pida los datos va a mostrar el error.
+        log.exception("No se pudieron precargar los datos de %s", directorio)
+    for modulo in MODULOS_DIFERIDOS:
+        try:
+            importlib.import_module(modulo)
+        except ImportError:
+            pass
+
+
+def iniciar(directorio=BASE_PATH):
+    # Arranca la precarga si todavía no corrió en este proceso.
+    global _hilo
+    with _lock:
+        if _hilo is None:
+            _hilo = threading.Thread(target=precargar, args=(directorio,), name='precarga', daemon=True)
+            _hilo.start()
+    return _hilo
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.express as px
+
+from datos import BASE_PATH, cargar_vuelos, contexto_procesos, descubrir_informes, leer_csv_cacheado
+from agregados import MatrizOD, celdas_od, construir_cubo, filtrar_cubo, kpis, por_dimension, serie_mensual
+from aeropuertos import RegistroAeropuertos
+
+# Reportes sin interfaz: las mismas cuentas que el dashboard (KPIs, series
+# mensuales, aerolíneas, aeropuertos y rutas) para un rango de fechas y un
+# conjunto de aeropuertos o aerolíneas, escritas a disco. Ejemplo, un
+# reporte por aeropuerto de todo 2023:
+#
+#     python reportes.py --por aeropuerto --desde 2023-01 --hasta 2023-12
+#
+# Los rangos de fechas van por mes, igual que el cubo de agregados.
+
+FORMATOS = ['parquet', 'csv', 'json']
+TOP_RUTAS = 10
+
+# Estado de cada proceso de trabajo: se carga una vez en el inicializador.
+_cubo = None
+_matriz = None
+_nombres = {}
+
+
+def _nombre_archivo(texto):
+    return re.sub(r'[^\w.-]+', '_', str(texto)).strip('_') or 'sin_nombre'
+
+
+def escribir_tabla(tabla, ruta_base, formatos):
+    for formato in formatos:
+        if formato == 'parquet':
+            tabla.to_parquet(ruta_base + '.parquet', index=False)
+        elif formato == 'csv':
+            tabla.to_csv(ruta_base + '.csv', index=False)
+        elif formato == 'json':
+            tabla.to_json(ruta_base + '.json', orient='records', date_format='iso', force_ascii=False)
+
+
+def escribir_grafico(figura, ruta_base):
+    # PNG si está kaleido para exportar imágenes; si no, HTML autocontenido.
+    try:
+        figura.write_image(ruta_base + '.png')
+        return ruta_base + '.png'
+    except (ImportError, ValueError, RuntimeError):
+        figura.write_html(ruta_base + '.html', include_plotlyjs='cdn')
+        return ruta_base + '.html'
+
+
+def calcular_reporte(cubo, matriz, tipo=None, codigo=None, desde=None, hasta=None, aerolineas=None):
+    # Tablas de un reporte: de un aeropuerto, de una aerolínea o (sin tipo)
+    # de toda la selección, como las pestañas del dashboard.
+    aeropuertos = [codigo] if tipo == 'aeropuerto' else None
+    if tipo == 'aerolinea':
+        aerolineas = [codigo]
+    seleccion = filtrar_cubo(cubo, desde, hasta, aeropuertos=aeropuertos, aerolineas=aerolineas)
+
+    tablas = {
+        'mensual': serie_mensual(seleccion, ['Vuelos', 'PAX']),
+        'aerolineas': por_dimension(seleccion, 'Aerolinea_Nombre', ['Vuelos', 'PAX']),
+        'movimientos': por_dimension(seleccion, 'Tipo_de_Movimiento', ['Vuelos', 'PAX']),
+    }
+    if tipo != 'aeropuerto':
+        tablas['aeropuertos'] = por_dimension(seleccion, 'Aeropuerto', ['Vuelos', 'PAX'])
+    if tipo == 'aeropuerto':
+        tablas['rutas'] = matriz.rutas(aeropuerto=codigo, aerolineas=aerolineas, desde=desde, hasta=hasta, top=TOP_RUTAS)
+    return kpis(seleccion), tablas
+
+
+def _graficos(tablas, titulo):
+    figuras = {
+        'mensual': px.line(tablas['mensual'], x='Mes', y='Vuelos', title=f"Vuelos por Mes – {titulo}", markers=True),
+        'aerolineas': px.bar(tablas['aerolineas'], x='Aerolinea_Nombre', y='Vuelos', title=f"Vuelos por Aerolínea – {titulo}"),
+    }
+    if 'rutas' in tablas:
+        figuras['rutas'] = px.bar(tablas['rutas'], x='Origen/Destino', y='Vuelos', hover_data=['PAX'], title=f"Rutas con más vuelos – {titulo}")
+    elif 'aeropuertos' in tablas:
+        figuras['aeropuertos'] = px.bar(tablas['aeropuertos'].head(30), x='Aeropuerto', y='Vuelos', title=f"Vuelos por Aeropuerto – {titulo}")
+    return figuras
+
+
+def escribir_reporte(directorio, tipo, codigo, desde, hasta, aerolineas, formatos, graficos):
+    indicadores, tablas = calcular_reporte(_cubo, _matriz, tipo, codigo, desde, hasta, aerolineas)
+    os.makedirs(directorio, exist_ok=True)
+    titulo = _nombres.get(codigo, codigo) if codigo is not None else 'Todos'
+    resumen = {
+        'tipo': tipo or 'general', 'codigo': codigo, 'nombre': titulo,
+        'desde': desde, 'hasta': hasta, 'aerolineas': aerolineas,
+        **indicadores,
+    }
+    with open(os.path.join(directorio, 'kpis.json'), 'w', encoding='utf-8') as f:
+        json.dump(resumen, f, ensure_ascii=False, indent=2, default=str)
+    for nombre, tabla in tablas.items():
+        escribir_tabla(tabla, os.path.join(directorio, nombre), formatos)
+    if graficos:
+        for nombre, figura in _graficos(tablas, titulo).items():
+            escribir_grafico(figura, os.path.join(directorio, nombre))
+    return codigo, indicadores['total_vuelos']
+
+
+def _iniciar_worker(cubo, celdas, nombres):
+    global _cubo, _matriz, _nombres
+    _cubo, _matriz, _nombres = cubo, MatrizOD(celdas), nombres
+
+
+def cargar(directorio=BASE_PATH, max_workers=None):
+    # Carga los informes del directorio y arma los agregados que usan los
+    # reportes; los vuelos no se guardan, solo el cubo y las celdas O-D.
+    vuelos, _, errores, _ = cargar_vuelos(descubrir_informes(directorio), max_workers)
+    for anio, error in errores.items():
+        print(f"Error al cargar el informe {anio}: {error}", file=sys.stderr)
+    cubo, celdas = construir_cubo(vuelos), celdas_od(vuelos)
+    del vuelos
+
+    nombres = {}
+    ruta_aeropuertos = os.path.join(directorio, 'aeropuertos_detalle.csv')
+    if os.path.exists(ruta_aeropuertos):
+        registro = RegistroAeropuertos(leer_csv_cacheado(ruta_aeropuertos))
+        filas, _ = registro.buscar_varios(cubo['Aeropuerto'].dropna().unique())
+        nombres = dict(zip(filas['codigo'], filas['denominacion']))
+    return cubo, celdas, nombres
+
+
+def generar(cubo, celdas, nombres, salida, por=None, codigos=None, desde=None, hasta=None,
+            aerolineas=None, formatos=('csv',), graficos=True, workers=None):
+    # Un reporte general y, con `por`, uno por aeropuerto o aerolínea (los
+    # indicados en `codigos` o todos los que tienen vuelos en el rango). Los
+    # reportes por entidad se reparten entre procesos de trabajo.
+    _iniciar_worker(cubo, celdas, nombres)
+    escritos = [escribir_reporte(os.path.join(salida, 'general'), None, None, desde, hasta,
+                                 aerolineas, formatos, graficos)]
+    if por is None:
+        return escritos
+
+    if not codigos:
+        seleccion = filtrar_cubo(cubo, desde, hasta, aerolineas=aerolineas)
+        columna = 'Aeropuerto' if por == 'aeropuerto' else 'Aerolinea_Nombre'
+        codigos = sorted(seleccion.loc[seleccion['Vuelos'] > 0, columna].dropna().astype(str).unique())
+    # Filtrar por aerolíneas solo tiene sentido en los reportes por aeropuerto.
+    filtro_aerolineas = aerolineas if por == 'aeropuerto' else None
+    tareas = [(os.path.join(salida, por, _nombre_archivo(codigo)), por, codigo, desde, hasta,
+               filtro_aerolineas, formatos, graficos) for codigo in codigos]
+
+    workers = min(len(tareas), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return escritos + [escribir_reporte(*tarea) for tarea in tareas]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=contexto_procesos(), initializer=_iniciar_worker,
+                             initargs=(cubo, celdas, nombres)) as pool:
+        futuros = [pool.submit(escribir_reporte, *tarea) for tarea in tareas]
+        return escritos + [futuro.result() for futuro in futuros]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Genera los reportes del dashboard sin la interfaz web.")
+    parser.add_argument('--datos', default=BASE_PATH, help="directorio con los informes (por defecto %(default)s)")
+    parser.add_argument('--salida', default='salida_reportes', help="directorio de salida (por defecto %(default)s)")
+    parser.add_argument('--desde', help="primer mes incluido, AAAA-MM")
+    parser.add_argument('--hasta', help="último mes incluido, AAAA-MM")
+    parser.add_argument('--por', choices=['aeropuerto', 'aerolinea'], help="además del general, un reporte por aeropuerto o por aerolínea")
+    parser.add_argument('--aeropuertos', nargs='+', help="aeropuertos a reportar con --por aeropuerto (por defecto, todos)")
+    parser.add_argument('--aerolineas', nargs='+', help="aerolíneas a incluir; con --por aerolinea, las que se reportan")
+    parser.add_argument('--formatos', nargs='+', choices=FORMATOS, default=['csv'], help="formatos de las tablas (por defecto csv)")
+    parser.add_argument('--sin-graficos', action='store_true', help="no escribir los gráficos")
+    parser.add_argument('--workers', type=int, help="procesos de trabajo (por defecto, uno por CPU)")
+    args = parser.parse_args(argv)
+
+    cubo, celdas, nombres = cargar(args.datos, args.workers)
+    codigos = args.aeropuertos if args.por == 'aeropuerto' else args.aerolineas if args.por == 'aerolinea' else None
+    escritos = generar(cubo, celdas, nombres, args.salida, por=args.por, codigos=codigos,
+                       desde=args.desde, hasta=args.hasta, aerolineas=args.aerolineas,
+                       formatos=args.formatos, graficos=not args.sin_graficos, workers=args.workers)
+    print(f"{len(escritos)} reportes escritos en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
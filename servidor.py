@@ -0,0 +1,25 @@
+import os
+import sys
+
+from streamlit.web import cli
+
+import precarga
+
+# Arranca el dashboard con la precarga en marcha desde el inicio del
+# servidor, antes de que se conecte la primera sesión:
+#
+#     python servidor.py [opciones de streamlit run, p. ej. --server.port 8501]
+#
+# Con `streamlit run app.py` la precarga arranca recién con la primera sesión.
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'app.py')
+
+
+def main(argv=None):
+    precarga.iniciar()
+    sys.argv = ['streamlit', 'run', APP] + list(sys.argv[1:] if argv is None else argv)
+    cli.main()
+
+
+if __name__ == "__main__":
+    main()